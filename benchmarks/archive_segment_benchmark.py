@@ -0,0 +1,56 @@
+import random
+import statistics
+import time
+
+from benchmarks.random_transactions import random_hex, random_transfer_transaction
+from haslo_blockchain.block import Block
+from haslo_blockchain.storage.archive_segment import ArchiveSegment
+from haslo_blockchain.storage.compression_dictionary import CompressionDictionary
+
+BLOCK_COUNT = 2000
+TRANSACTIONS_PER_BLOCK = 20
+RANDOM_READS = 500
+
+
+def create_blocks():
+    return [
+        Block(index, [random_transfer_transaction(index * TRANSACTIONS_PER_BLOCK + i, random.randint(0, 5))
+                     for i in range(TRANSACTIONS_PER_BLOCK)],
+              random_hex(64), random.randint(0, 999999999), 4, 1638307200 + index * 10, random_hex(64))
+        for index in range(BLOCK_COUNT)
+    ]
+
+
+def benchmark(name, blocks, raw_size, **seal_arguments):
+    start = time.perf_counter()
+    segment = ArchiveSegment.seal(blocks, **seal_arguments)
+    seal_time = time.perf_counter() - start
+    latencies = []
+    for index in random.sample(range(BLOCK_COUNT), RANDOM_READS):
+        start = time.perf_counter()
+        segment.read_encoded_block(index)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(f'{name:<32} ratio {raw_size / len(segment.data):5.2f}x  '
+          f'seal {seal_time:6.2f}s  '
+          f'random read mean {statistics.mean(latencies) * 1e6:7.1f}us  '
+          f'p99 {latencies[int(len(latencies) * 0.99)] * 1e6:7.1f}us')
+
+
+def main():
+    random.seed(0)
+    blocks = create_blocks()
+    encoded_blocks = [ArchiveSegment.encode_block(block) for block in blocks]
+    raw_size = sum(len(encoded_block) for encoded_block in encoded_blocks)
+    dictionary = CompressionDictionary.train(encoded_blocks[:200])
+    print(f'{BLOCK_COUNT} blocks, {TRANSACTIONS_PER_BLOCK} transactions each, {raw_size / 1e6:.1f} MB of JSON')
+    benchmark('zlib, 1 block per chunk', blocks, raw_size, blocks_per_chunk=1)
+    benchmark('zlib+dict, 1 block per chunk', blocks, raw_size, dictionary=dictionary, blocks_per_chunk=1)
+    benchmark('zlib, 16 blocks per chunk', blocks, raw_size)
+    benchmark('zlib+dict, 16 blocks per chunk', blocks, raw_size, dictionary=dictionary)
+    benchmark('lzma, 16 blocks per chunk', blocks, raw_size, codec=ArchiveSegment.CODEC_LZMA)
+    benchmark('lzma, 64 blocks per chunk', blocks, raw_size, codec=ArchiveSegment.CODEC_LZMA, blocks_per_chunk=64)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import json
+import random
+import time
+
+from benchmarks.random_transactions import random_hex, random_transfer_transaction
+from haslo_blockchain.block import Block
+
+BLOCK_COUNT = 500
+TRANSACTIONS_PER_BLOCK = 100
+
+
+def create_encoded_blocks():
+    encoded_blocks = []
+    for index in range(BLOCK_COUNT):
+        transactions = [random_transfer_transaction(index) for _ in range(TRANSACTIONS_PER_BLOCK)]
+        block = Block(index, transactions, random_hex(64), index, 4, 1638307200 + index * 10, None)
+        block.current_hash = block.compute_hash()
+        encoded_blocks.append(block.encode())
+    return encoded_blocks
+
+
+def eager_decode(encoded_block):
+    header, _, encoded_transactions = encoded_block.partition(b'\n')
+    data = json.loads(header)
+    data['transactions'] = json.loads(encoded_transactions)
+    return Block.from_dict(data)
+
+
+def benchmark(name, encoded_blocks, workload):
+    start = time.perf_counter()
+    for encoded_block in encoded_blocks:
+        workload(encoded_block)
+    elapsed = time.perf_counter() - start
+    print(f'{name:<36} {elapsed / (BLOCK_COUNT * TRANSACTIONS_PER_BLOCK) * 1e6:7.3f}us per transaction')
+
+
+def main():
+    random.seed(0)
+    encoded_blocks = create_encoded_blocks()
+    print(f'{BLOCK_COUNT} blocks, {TRANSACTIONS_PER_BLOCK} transactions each')
+    benchmark('eager decode, header only', encoded_blocks, lambda data: eager_decode(data).index)
+    benchmark('lazy decode, header only', encoded_blocks, lambda data: Block.decode(data).index)
+    benchmark('eager decode, hash check', encoded_blocks, lambda data: eager_decode(data).compute_hash())
+    benchmark('lazy decode, hash check', encoded_blocks, lambda data: Block.decode(data).compute_hash())
+    benchmark('lazy decode, one transaction', encoded_blocks, lambda data: Block.decode(data).transaction(0))
+    benchmark('lazy decode, all transactions', encoded_blocks, lambda data: Block.decode(data).transactions)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import asyncio
+import random
+import time
+
+from benchmarks.random_transactions import random_hex, random_transfer_transaction
+from haslo_blockchain.api.query_server import QueryServer
+from haslo_blockchain.block import Block
+from haslo_blockchain.blockchain import Blockchain
+
+BLOCK_COUNT = 1000
+TRANSACTIONS_PER_BLOCK = 20
+CONNECTIONS = 8
+REQUESTS_PER_CONNECTION = 2000
+
+
+def create_blockchain():
+    blockchain = Blockchain(4, [Block(0, [], '0', 0, 4, 1638307200, random_hex(64))])
+    for index in range(1, BLOCK_COUNT):
+        transactions = [random_transfer_transaction(index) for _ in range(TRANSACTIONS_PER_BLOCK)]
+        blockchain.add_block(Block(index, transactions, blockchain.last_block.current_hash, index, 4,
+                                   1638307200 + index * 10, random_hex(64)))
+    return blockchain
+
+
+async def client(port, paths):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for path in paths:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+        content_length = 0
+        while True:
+            header_line = await reader.readline()
+            if header_line == b'\r\n':
+                break
+            if header_line.lower().startswith(b'content-length:'):
+                content_length = int(header_line.split(b':')[1])
+        await reader.readexactly(content_length)
+    writer.close()
+
+
+async def benchmark(name, blockchain, cache_bytes):
+    server = QueryServer(blockchain, cache_bytes=cache_bytes)
+    listener = await server.start('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    # a skewed workload: most clients ask for recent blocks
+    paths = [
+        [f'/blocks/{BLOCK_COUNT - 1 - min(int(random.expovariate(0.02)), BLOCK_COUNT - 1)}'
+         for _ in range(REQUESTS_PER_CONNECTION)]
+        for _ in range(CONNECTIONS)
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, connection_paths) for connection_paths in paths))
+    elapsed = time.perf_counter() - start
+    listener.close()
+    await listener.wait_closed()
+    print(f'{name:<16} {CONNECTIONS * REQUESTS_PER_CONNECTION / elapsed:9.0f} requests/s  '
+          f'cache hits {server.cache.hits}, misses {server.cache.misses}')
+
+
+async def main():
+    random.seed(0)
+    blockchain = create_blockchain()
+    print(f'{BLOCK_COUNT} blocks, {TRANSACTIONS_PER_BLOCK} transactions each, '
+          f'{CONNECTIONS} keep-alive connections')
+    await benchmark('without cache', blockchain, 0)
+    await benchmark('with cache', blockchain, QueryServer.DEFAULT_CACHE_BYTES)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
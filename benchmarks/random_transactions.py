@@ -0,0 +1,20 @@
+import random
+
+from haslo_blockchain.transaction import Transaction
+
+
+def random_hex(length):
+    return f'{random.getrandbits(length * 4):0{length}x}'
+
+
+def random_transfer_transaction(nonce, tip=1):
+    return Transaction.from_dict({
+        "type": "transfer",
+        "sender": random_hex(40),
+        "payload": {"recipient": random_hex(40), "amount": random.randint(1, 10 ** 6)},
+        "nonce": nonce,
+        "chain_id": {"chain_id": "main", "version": 1},
+        "gas": {"tip": tip, "max_fee": 50, "limit": 100},
+        "signature": {"type": "ECDSA", "r": random_hex(64), "s": random_hex(64), "v": 27,
+                      "public_key": random_hex(128)},
+    })
@@ -0,0 +1,163 @@
+import bisect
+import itertools
+import json
+import time
+from collections import Counter, OrderedDict
+
+from haslo_blockchain.admission.token_bucket import TokenBucket
+from haslo_blockchain.security.hashing import Hashing
+from haslo_blockchain.transaction import Transaction
+from haslo_blockchain.util.magic_strings import MagicStrings
+
+
+class TransactionAdmission:
+    STAGE_RATE_LIMIT = 'rate_limit'
+    STAGE_SIZE = 'size'
+    STAGE_SCHEMA = 'schema'
+    STAGE_CHAIN_ID = 'chain_id'
+    STAGE_GAS = 'gas'
+    STAGE_NONCE = 'nonce'
+    STAGE_DUPLICATE = 'duplicate'
+    STAGE_QUEUE = 'queue'
+    STAGE_SIGNATURE = 'signature'
+    DEFAULT_MAX_MESSAGE_SIZE = 16 * 1024
+    DEFAULT_MAX_GAS_LIMIT = 1000000
+    DEFAULT_NONCE_WINDOW = 64
+    DEFAULT_QUEUE_SIZE = 10000
+    DEFAULT_SEEN_HASHES = 100000
+    DEFAULT_PEER_RATE = 50
+    DEFAULT_PEER_BURST = 100
+    TRANSACTION_FIELDS = {
+        'type': str,
+        'sender': str,
+        'payload': dict,
+        'nonce': int,
+        'chain_id': dict,
+        'gas': dict,
+        'signature': dict,
+    }
+    PAYLOAD_FIELDS = {
+        MagicStrings.TRANSACTION_TYPE_TRANSFER: {'recipient': str, 'amount': int},
+    }
+    GAS_FIELDS = {'tip': int, 'max_fee': int, 'limit': int}
+    SIGNATURE_FIELDS = ('type', 'r', 's', 'v', 'public_key')
+
+    def __init__(self, chain_id, next_nonce=lambda sender: 0, min_fee=0, max_gas_limit=DEFAULT_MAX_GAS_LIMIT,
+                 max_message_size=DEFAULT_MAX_MESSAGE_SIZE, nonce_window=DEFAULT_NONCE_WINDOW,
+                 queue_size=DEFAULT_QUEUE_SIZE, seen_hashes=DEFAULT_SEEN_HASHES, peer_rate=DEFAULT_PEER_RATE,
+                 peer_burst=DEFAULT_PEER_BURST, clock=time.monotonic):
+        self.chain_id = chain_id.to_dict()
+        self.next_nonce = next_nonce
+        self.min_fee = min_fee
+        self.max_gas_limit = max_gas_limit
+        self.max_message_size = max_message_size
+        self.nonce_window = nonce_window
+        self.queue_size = queue_size
+        self.seen_hashes = seen_hashes
+        self.peer_rate = peer_rate
+        self.peer_burst = peer_burst
+        self.clock = clock
+        self.counters = Counter()
+        self.queue = []  # (tip, sequence, transaction hash, transaction dict), sorted so the highest tip pops first
+        self._sequence = itertools.count()
+        self._seen = OrderedDict()
+        self._peer_buckets = {}
+
+    def admit(self, peer, message):
+        # checks run from cheapest to most expensive, returns the rejecting stage or None once queued
+        self.counters['received'] += 1
+        stage, transaction_dict, transaction_hash = self.pre_validate(peer, message)
+        if stage is not None:
+            self.counters[stage] += 1
+            return stage
+        if not self.enqueue(transaction_dict, transaction_hash):
+            self.counters[self.STAGE_QUEUE] += 1
+            return self.STAGE_QUEUE
+        # only queued transactions count as seen, so a rejected or shed one can be rebroadcast later
+        self._seen[transaction_hash] = None
+        if len(self._seen) > self.seen_hashes:
+            self._seen.popitem(last=False)
+        self.counters['queued'] += 1
+        return None
+
+    def pre_validate(self, peer, message):
+        bucket = self._peer_buckets.get(peer)
+        if bucket is None:
+            bucket = self._peer_buckets[peer] = TokenBucket(self.peer_rate, self.peer_burst, self.clock)
+        if not bucket.consume():
+            return self.STAGE_RATE_LIMIT, None, None
+        if len(message) > self.max_message_size:
+            return self.STAGE_SIZE, None, None
+        transaction_dict = self.parse(message)
+        if transaction_dict is None:
+            return self.STAGE_SCHEMA, None, None
+        if transaction_dict['chain_id'] != self.chain_id:
+            return self.STAGE_CHAIN_ID, None, None
+        if not self.valid_gas(transaction_dict['gas']):
+            return self.STAGE_GAS, None, None
+        next_nonce = self.next_nonce(transaction_dict['sender'])
+        if not next_nonce <= transaction_dict['nonce'] < next_nonce + self.nonce_window:
+            return self.STAGE_NONCE, None, None
+        transaction_hash = Hashing.compute_transaction_hash(transaction_dict)
+        if transaction_hash in self._seen:
+            return self.STAGE_DUPLICATE, None, None
+        return None, transaction_dict, transaction_hash
+
+    def parse(self, message):
+        try:
+            data = json.loads(message)
+        except (ValueError, RecursionError):
+            # deeply nested input fits under the size limit but exhausts the decoder's recursion
+            return None
+        if not isinstance(data, dict) or data.get('type') != 'transaction_broadcast':
+            return None
+        transaction_dict = data.get('transaction')
+        if not self.has_fields(transaction_dict, self.TRANSACTION_FIELDS):
+            return None
+        payload_fields = self.PAYLOAD_FIELDS.get(transaction_dict['type'])
+        if payload_fields is None or not self.has_fields(transaction_dict['payload'], payload_fields):
+            return None
+        if not self.has_fields(transaction_dict['gas'], self.GAS_FIELDS):
+            return None
+        if transaction_dict['signature'].keys() != set(self.SIGNATURE_FIELDS):
+            return None
+        return transaction_dict
+
+    @staticmethod
+    def has_fields(data, fields):
+        # extra keys are rejected, so the duplicate hash is taken over exactly what Transaction.to_dict() produces
+        return isinstance(data, dict) and data.keys() == fields.keys() and all(
+            isinstance(data.get(field), field_type) and not isinstance(data.get(field), bool)
+            for field, field_type in fields.items()
+        )
+
+    def valid_gas(self, gas):
+        return (0 <= gas['tip'] <= gas['max_fee'] and
+                gas['max_fee'] >= self.min_fee and
+                0 < gas['limit'] <= self.max_gas_limit)
+
+    def enqueue(self, transaction_dict, transaction_hash):
+        entry = (transaction_dict['gas']['tip'], -next(self._sequence), transaction_hash, transaction_dict)
+        if len(self.queue) >= self.queue_size:
+            # shed the cheapest queued transaction, unless the new one is no better
+            if not self.queue or entry[:2] <= self.queue[0][:2]:
+                return False
+            _, _, shed_hash, _ = self.queue.pop(0)
+            self._seen.pop(shed_hash, None)
+            self.counters['shed'] += 1
+        bisect.insort(self.queue, entry)
+        return True
+
+    def drain(self, verify_signature, limit=None):
+        # limit caps the signature checks per call, not the number of accepted transactions
+        transactions = []
+        verified = 0
+        while self.queue and (limit is None or verified < limit):
+            _, _, _, transaction_dict = self.queue.pop()
+            verified += 1
+            if not verify_signature(transaction_dict):
+                self.counters[self.STAGE_SIGNATURE] += 1
+                continue
+            self.counters['accepted'] += 1
+            transactions.append(Transaction.from_dict(transaction_dict))
+        return transactions
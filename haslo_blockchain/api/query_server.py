@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+from haslo_blockchain.api.response_cache import CachedResponse, ResponseCache
+
+
+class QueryServer:
+    DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+    DEFAULT_FINALITY_DEPTH = 1  # blocks at least this far below the tip never change
+    MAX_INDEX_DIGITS = 20  # far beyond any chain height, and well under the digit limit of int()
+    REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+    def __init__(self, blockchain, cache_bytes=DEFAULT_CACHE_BYTES, finality_depth=DEFAULT_FINALITY_DEPTH):
+        self.blockchain = blockchain
+        self.cache = ResponseCache(cache_bytes)
+        self.finality_depth = finality_depth
+        self._indexes_by_hash = {}
+        self._hash_indexed_length = 0
+
+    async def start(self, host, port):
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    header_line = await reader.readline()
+                    if header_line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header_line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    writer.write(self.error_response(400, "Malformed request line"))
+                    break
+                method, path, protocol = parts
+                if method != 'GET':
+                    writer.write(self.error_response(405, "Only GET is supported"))
+                else:
+                    writer.write(self.respond(path, headers.get('if-none-match')))
+                await writer.drain()
+                if protocol == 'HTTP/1.0' or headers.get('connection', '').lower() == 'close':
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def respond(self, path, if_none_match=None):
+        # '/blocks/0002' and '/blocks/2/' name the same resource, so they share one cache entry
+        parts = [str(int(part)) if self.is_index(part) else part for part in path.rstrip('/').split('/')[1:]]
+        path = '/' + '/'.join(parts)
+        cached_response = self.cache.get(path)
+        if cached_response is None:
+            snapshot = self.blockchain.snapshot
+            try:
+                data, etag = self.route(snapshot, parts)
+            except LookupError as error:
+                return self.error_response(404, str(error.args[0]) if error.args else "Not found")
+            if etag is None:
+                return self.encode_response(200, data)
+            cached_response = CachedResponse(
+                etag,
+                self.encode_response(200, data, etag),
+                self.encode_response(304, None, etag),
+            )
+            self.cache.put(path, cached_response)
+        if if_none_match == cached_response.etag:
+            return cached_response.not_modified_response
+        return cached_response.response
+
+    def route(self, snapshot, parts):
+        if parts == ['tip']:
+            return snapshot.last_block.to_dict(), None
+        if parts == ['difficulty']:
+            return {'difficulty': snapshot.difficulty}, None
+        if len(parts) == 3 and parts[:2] == ['blocks', 'hash']:
+            block = snapshot[self.index_by_hash(snapshot, parts[2])]
+            return block.to_dict(), self.etag(snapshot, block)
+        if len(parts) in (2, 4) and parts[0] == 'blocks' and self.is_index(parts[1]):
+            block = snapshot[int(parts[1])]
+            if len(parts) == 2:
+                return block.to_dict(), self.etag(snapshot, block)
+            if parts[2] == 'transactions' and self.is_index(parts[3]):
+                transaction = block.transaction(int(parts[3]))
+                etag = self.etag(snapshot, block)
+                return transaction.to_dict(), etag and f'"{block.current_hash}/{parts[3]}"'
+        raise LookupError("Unknown resource")
+
+    @classmethod
+    def is_index(cls, part):
+        # isdigit() alone accepts characters such as '²' that int() rejects, and int() refuses very long numbers
+        return len(part) <= cls.MAX_INDEX_DIGITS and part.isascii() and part.isdecimal()
+
+    def index_by_hash(self, snapshot, block_hash):
+        for index in range(self._hash_indexed_length, len(snapshot)):
+            self._indexes_by_hash[snapshot[index].current_hash] = index
+        self._hash_indexed_length = max(self._hash_indexed_length, len(snapshot))
+        index = self._indexes_by_hash.get(block_hash)
+        if index is None or index >= len(snapshot):
+            raise LookupError("Unknown block hash")
+        return index
+
+    def etag(self, snapshot, block):
+        if block.index > len(snapshot) - 1 - self.finality_depth:
+            return None
+        return f'"{block.current_hash}"'
+
+    def error_response(self, status, message):
+        return self.encode_response(status, {'error': message})
+
+    def encode_response(self, status, data, etag=None):
+        body = json.dumps(data).encode() if data is not None else b''
+        headers = [
+            f'HTTP/1.1 {status} {self.REASONS[status]}',
+            'Content-Type: application/json',
+            f'Content-Length: {len(body)}',
+        ]
+        if etag is not None:
+            headers.append(f'ETag: {etag}')
+            headers.append('Cache-Control: public, max-age=31536000, immutable')
+        else:
+            headers.append('Cache-Control: no-cache')
+        return ('\r\n'.join(headers) + '\r\n\r\n').encode() + body
@@ -0,0 +1,46 @@
+from collections import OrderedDict
+
+
+class CachedResponse:
+    def __init__(self, etag, response, not_modified_response):
+        self.etag = etag
+        self.response = response
+        self.not_modified_response = not_modified_response
+
+    def __len__(self):
+        return len(self.response) + len(self.not_modified_response)
+
+
+class ResponseCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        cached_response = self._entries.get(key)
+        if cached_response is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return cached_response
+
+    def put(self, key, cached_response):
+        if len(cached_response) > self.max_bytes:
+            return
+        if key in self._entries:
+            self.size -= len(self._entries.pop(key))
+        self._entries[key] = cached_response
+        self.size += len(cached_response)
+        while self.size > self.max_bytes:
+            _, evicted_response = self._entries.popitem(last=False)
+            self.size -= len(evicted_response)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
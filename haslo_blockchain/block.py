@@ -1,18 +1,130 @@
+import json
+
+from haslo_blockchain.security.hashing import Hashing
+from haslo_blockchain.transaction import Transaction
+
+
 class Block:
+    HASHED_FIELDS = frozenset({'index', 'timestamp', 'previous_hash', 'proof', 'difficulty'})
+
     def __init__(self, index, transactions, previous_hash, proof, difficulty, timestamp, current_hash):
         self.index = index
         self.timestamp = timestamp
-        self.transactions = transactions
         self.previous_hash = previous_hash
         self.proof = proof
         self.difficulty = difficulty
         self.current_hash = current_hash
+        self._transactions = self._freeze(transactions)
+        self._encoded_transactions = None
+        self._transaction_dicts = None
+        self._decoded_transactions = {}
+        self._computed_hash = None
+
+    def __setattr__(self, name, value):
+        if name in self.HASHED_FIELDS:
+            self.__dict__['_computed_hash'] = None
+        super().__setattr__(name, value)
+
+    @classmethod
+    def from_encoded(cls, index, encoded_transactions, previous_hash, proof, difficulty, timestamp, current_hash):
+        # blocks from storage or the network keep their encoded body and only decode the transactions that are used
+        block = cls(index, None, previous_hash, proof, difficulty, timestamp, current_hash)
+        block._encoded_transactions = encoded_transactions
+        return block
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            index=data['index'],
+            transactions=[Transaction.from_dict(transaction) for transaction in data['transactions']],
+            previous_hash=data['previous_hash'],
+            proof=data['proof'],
+            difficulty=data['difficulty'],
+            timestamp=data['timestamp'],
+            current_hash=data['current_hash'],
+        )
+
+    @classmethod
+    def decode(cls, data):
+        header, _, encoded_transactions = bytes(data).partition(b'\n')
+        return cls.from_encoded(encoded_transactions=encoded_transactions, **json.loads(header))
+
+    @property
+    def transactions(self):
+        if self._transactions is None and self._encoded_transactions is not None:
+            # a tuple like eager transactions, so the encoded body cannot drift from what callers see
+            self._transactions = tuple(self.transaction(position) for position in range(len(self.transaction_dicts())))
+        return self._transactions
+
+    @transactions.setter
+    def transactions(self, transactions):
+        self._transactions = self._freeze(transactions)
+        self._encoded_transactions = None
+        self._transaction_dicts = None
+        self._decoded_transactions = {}
+        self._computed_hash = None
+
+    @staticmethod
+    def _freeze(transactions):
+        # the cached block hash covers the transactions, so they are replaced through the setter, never edited in place
+        return tuple(transactions) if isinstance(transactions, list) else transactions
+
+    @property
+    def encoded_transactions(self):
+        if self._encoded_transactions is not None:
+            return self._encoded_transactions
+        return Hashing.encode_transactions(self._transactions)
+
+    def transaction(self, position):
+        if self._transactions is not None:
+            return self._transactions[position]
+        transaction = self._decoded_transactions.get(position)
+        if transaction is None:
+            transaction = Transaction.from_dict(self.transaction_dicts()[position])
+            self._decoded_transactions[position] = transaction
+        return transaction
+
+    def transaction_dicts(self):
+        if self._encoded_transactions is None:
+            return [transaction.to_dict() for transaction in self._transactions]
+        if self._transaction_dicts is None:
+            self._transaction_dicts = json.loads(self._encoded_transactions)
+        return self._transaction_dicts
+
+    def to_dict(self):
+        return {
+            'index': self.index,
+            'timestamp': self.timestamp,
+            'transactions': self.transaction_dicts(),
+            'previous_hash': self.previous_hash,
+            'proof': self.proof,
+            'difficulty': self.difficulty,
+            'current_hash': self.current_hash,
+        }
+
+    def encode(self):
+        header = json.dumps({
+            'index': self.index,
+            'timestamp': self.timestamp,
+            'previous_hash': self.previous_hash,
+            'proof': self.proof,
+            'difficulty': self.difficulty,
+            'current_hash': self.current_hash,
+        }, sort_keys=True, separators=(',', ':'))
+        return header.encode() + b'\n' + self.encoded_transactions
+
+    def compute_hash(self):
+        return Hashing.compute_block_hash(self, self.encoded_transactions)
+
+    @property
+    def block_hash(self):
+        # blocks are identified by the hash of their contents, never by the current_hash they claim
+        if self._computed_hash is None:
+            self._computed_hash = self.compute_hash()
+        return self._computed_hash
 
     def __eq__(self, other):
-        return (self.index == other.index and
-                self.timestamp == other.timestamp and
-                self.transactions == other.transactions and
-                self.previous_hash == other.previous_hash and
-                self.proof == other.proof and
-                self.difficulty == other.difficulty and
-                self.current_hash == other.current_hash)
+        return isinstance(other, Block) and self.block_hash == other.block_hash
+
+    def __hash__(self):
+        return hash(self.block_hash)
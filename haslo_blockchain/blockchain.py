@@ -1,25 +1,70 @@
 import hashlib
+import threading
+import time
 
 from haslo_blockchain.block import Block
+from haslo_blockchain.chain_snapshot import ChainSnapshot
 from haslo_blockchain.util.difficulty_manager import DifficultyManager
 
 
 class Blockchain:
     def __init__(self, difficulty, chain):
-        self.difficulty = difficulty
+        self._difficulty = difficulty
         self.chain = chain
         if not self.valid_chain():
             raise ValueError("Invalid chain provided")
+        self._write_lock = threading.Lock()
+        self._snapshot = ChainSnapshot(self.chain, len(self.chain), difficulty)
 
-    def create_block(self, transactions, previous_hash, proof, difficulty, adjust_difficulty):
-        block = Block(len(self.chain), transactions, previous_hash, proof, difficulty)
-        self.chain.append(block)
-        if adjust_difficulty:
-            self.difficulty = DifficultyManager(self).adjusted_difficulty(DifficultyManager.DEFAULT_TARGET_BLOCK_TIME)
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def difficulty(self):
+        return self._difficulty
+
+    @difficulty.setter
+    def difficulty(self, difficulty):
+        with self._write_lock:
+            self._difficulty = difficulty
+            self._publish()
+
+    def create_block(self, transactions, previous_hash, proof, difficulty, adjust_difficulty,
+                     target_block_time=DifficultyManager.DEFAULT_TARGET_BLOCK_TIME):
+        with self._write_lock:
+            # the proof was searched without the lock, so the tip or the difficulty may have moved on since
+            if previous_hash != self.last_block.current_hash or difficulty != self._difficulty:
+                return None
+            if not self.valid_proof(self.last_block.proof, proof, difficulty):
+                return None
+            block = Block(len(self.chain), transactions, previous_hash, proof, difficulty, time.time(), None)
+            block.current_hash = block.compute_hash()
+            self._append(block, adjust_difficulty, target_block_time)
         return block
 
-    def add_block(self, block):
+    def add_block(self, block, adjust_difficulty=False, target_block_time=DifficultyManager.DEFAULT_TARGET_BLOCK_TIME):
+        with self._write_lock:
+            self._append(block, adjust_difficulty, target_block_time)
+
+    def import_block(self, block, adjust_difficulty=False,
+                     target_block_time=DifficultyManager.DEFAULT_TARGET_BLOCK_TIME):
+        with self._write_lock:
+            if not self.validate_block(block):
+                return False
+            self._append(block, adjust_difficulty, target_block_time)
+        return True
+
+    def _append(self, block, adjust_difficulty, target_block_time):
+        # callers hold the write lock, so the block and the adjusted difficulty are published together
         self.chain.append(block)
+        if adjust_difficulty:
+            self._difficulty = DifficultyManager(self).adjusted_difficulty(target_block_time)
+        self._publish()
+
+    def _publish(self):
+        # readers pick up the new tip and difficulty together with a single attribute swap
+        self._snapshot = ChainSnapshot(self.chain, len(self.chain), self._difficulty)
 
     def validate_block(self, block):
         if block.current_hash != block.compute_hash():
@@ -43,16 +88,20 @@ class Blockchain:
             return False
         if not all(isinstance(block, Block) for block in self.chain):
             return False
-        for i in range(1, len(self.chain)):
-            previous_block = self.chain[i - 1]
-            current_block = self.chain[i]
+        return self.valid_blocks(self.chain)
+
+    @classmethod
+    def valid_blocks(cls, blocks):
+        for i in range(1, len(blocks)):
+            previous_block = blocks[i - 1]
+            current_block = blocks[i]
             current_computed_hash = current_block.compute_hash()
             if current_block.current_hash != current_computed_hash:
                 return False
             if current_block.previous_hash != previous_block.current_hash:
                 return False
             block_difficulty = current_block.difficulty
-            if not self.valid_proof(previous_block.proof, current_block.proof, block_difficulty):
+            if not cls.valid_proof(previous_block.proof, current_block.proof, block_difficulty):
                 return False
         return True
 
@@ -60,5 +109,30 @@ class Blockchain:
     def last_block(self):
         return self.chain[-1]
 
+    def fork_index(self, other):
+        # blocks link to their predecessors by hash, so equal blocks at one height mean equal chains below it
+        snapshot, other_snapshot = self.snapshot, other.snapshot
+        low, high = 0, min(len(snapshot), len(other_snapshot)) - 1
+        common_index = -1
+        while low <= high:
+            middle = (low + high) // 2
+            if snapshot[middle] == other_snapshot[middle]:
+                common_index = middle
+                low = middle + 1
+            else:
+                high = middle - 1
+        return common_index
+
+    def equals(self, other, deep_verify=False):
+        snapshot, other_snapshot = self.snapshot, other.snapshot
+        if len(snapshot) != len(other_snapshot) or snapshot.last_block != other_snapshot.last_block:
+            return False
+        if not deep_verify:
+            return True
+        # equal block hashes only mean equal contents, the claimed hashes, links and proofs still need checking
+        return (all(block == other_block for block, other_block in zip(snapshot, other_snapshot)) and
+                self.valid_blocks(snapshot) and
+                self.valid_blocks(other_snapshot))
+
     def __eq__(self, other):
-        return self.chain == other.chain and self.last_block == other.last_block
+        return isinstance(other, Blockchain) and self.equals(other)
@@ -0,0 +1,23 @@
+class ChainSnapshot:
+    def __init__(self, blocks, length, difficulty):
+        # blocks is the blockchain's append-only list, entries past length belong to later snapshots
+        self._blocks = blocks
+        self._length = length
+        self.difficulty = difficulty
+        self.last_block = blocks[length - 1] if length else None
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._blocks[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Block index out of range")
+        return self._blocks[index]
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self._blocks[index]
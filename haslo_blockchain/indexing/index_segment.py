@@ -0,0 +1,56 @@
+import heapq
+import json
+import os
+
+
+class IndexSegment:
+    DEFAULT_FAN_IN = 64
+
+    @staticmethod
+    def write(path, entries):
+        # entries are (key, value) pairs, written sorted by key so segments can be merged without loading them
+        temporary_path = f'{path}.tmp'
+        with open(temporary_path, 'w') as segment_file:
+            for entry in sorted(entries, key=lambda entry: entry[0]):
+                segment_file.write(json.dumps(entry) + '\n')
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def read(path):
+        with open(path) as segment_file:
+            for line in segment_file:
+                yield tuple(json.loads(line))
+
+    @classmethod
+    def merge(cls, paths, output_path, fan_in=DEFAULT_FAN_IN):
+        # merges at most fan_in segments at a time, in several passes if needed, to bound the open files
+        if fan_in < 2:
+            raise ValueError("Merging needs a fan-in of at least two segments")
+        paths = list(paths)
+        intermediate_paths = []
+        merge_pass = 0
+        while len(paths) > fan_in:
+            merged_paths = []
+            for group_start in range(0, len(paths), fan_in):
+                merged_path = f'{output_path}.pass{merge_pass}_{len(merged_paths)}'
+                cls._merge_group(paths[group_start:group_start + fan_in], merged_path)
+                merged_paths.append(merged_path)
+            for path in intermediate_paths:
+                os.remove(path)
+            intermediate_paths = paths = merged_paths
+            merge_pass += 1
+        entries = cls._merge_group(paths, output_path)
+        for path in intermediate_paths:
+            os.remove(path)
+        return entries
+
+    @classmethod
+    def _merge_group(cls, paths, output_path):
+        temporary_path = f'{output_path}.tmp'
+        entries = 0
+        with open(temporary_path, 'w') as output_file:
+            for entry in heapq.merge(*(cls.read(path) for path in paths), key=lambda entry: entry[0]):
+                output_file.write(json.dumps(entry) + '\n')
+                entries += 1
+        os.replace(temporary_path, output_path)
+        return entries
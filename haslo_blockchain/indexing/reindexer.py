@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from haslo_blockchain.indexing.index_segment import IndexSegment
+from haslo_blockchain.security.hashing import Hashing
+from haslo_blockchain.storage.archive_segment import ArchiveSegment
+from haslo_blockchain.storage.compression_dictionary import CompressionDictionary
+from haslo_blockchain.util.magic_strings import MagicStrings
+
+
+def index_chunk(segment_path, dictionary_path, chunk_directory):
+    dictionary = CompressionDictionary.load(dictionary_path) if dictionary_path else None
+    indexes = {name: [] for name in Reindexer.INDEXES}
+    transfers = []
+    transaction_count = 0
+    with ArchiveSegment.open(segment_path, dictionary) as segment:
+        for block in segment.blocks():
+            indexes['difficulty'].append((block.index, block.difficulty))
+            for position, transaction_dict in enumerate(block.transaction_dicts()):
+                location = [block.index, position]
+                indexes['transactions'].append((Hashing.compute_transaction_hash(transaction_dict), location))
+                indexes['addresses'].append((transaction_dict['sender'], location))
+                if transaction_dict['type'] == MagicStrings.TRANSACTION_TYPE_TRANSFER:
+                    recipient = transaction_dict['payload']['recipient']
+                    if recipient != transaction_dict['sender']:
+                        indexes['addresses'].append((recipient, location))
+                    transfers.append((transaction_dict['sender'], recipient, transaction_dict['payload']['amount'],
+                                      transaction_dict['nonce']))
+                transaction_count += 1
+    for name, entries in indexes.items():
+        IndexSegment.write(os.path.join(chunk_directory, f'{name}.jsonl'), entries)
+    # account state depends on block order, so it is only extracted here and replayed in sequence afterwards
+    temporary_path = os.path.join(chunk_directory, 'transfers.json.tmp')
+    with open(temporary_path, 'w') as transfers_file:
+        json.dump(transfers, transfers_file)
+    os.replace(temporary_path, os.path.join(chunk_directory, 'transfers.json'))
+    return segment.block_count, transaction_count
+
+
+class Reindexer:
+    INDEXES = ('transactions', 'addresses', 'difficulty')
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, segment_paths, output_directory, dictionary_path=None, processes=None, progress=print):
+        self.output_directory = output_directory
+        self.work_directory = os.path.join(output_directory, 'work')
+        self.dictionary_path = dictionary_path
+        self.processes = processes
+        self.progress = progress
+        dictionary = CompressionDictionary.load(dictionary_path) if dictionary_path else None
+        ranges = []
+        for path in segment_paths:
+            with ArchiveSegment.open(path, dictionary) as segment:
+                ranges.append((segment.first_index, segment.last_index, os.path.abspath(path)))
+        ranges.sort()
+        for (_, previous_last_index, _), (first_index, _, path) in zip(ranges, ranges[1:]):
+            if first_index != previous_last_index + 1:
+                raise ValueError(f"Segment {path} does not continue at block {previous_last_index + 1}")
+        self.segment_paths = [path for _, _, path in ranges]
+        self.block_count = sum(last_index - first_index + 1 for first_index, last_index, _ in ranges)
+
+    def run(self):
+        os.makedirs(self.work_directory, exist_ok=True)
+        manifest = self.load_manifest()
+        self.progress(f'reindexing {self.block_count} blocks from {len(self.segment_paths)} segments')
+        self.index_chunks(manifest)
+        self.merge_indexes(manifest)
+        self.replay_accounts(manifest)
+        return manifest
+
+    def load_manifest(self):
+        manifest_path = os.path.join(self.work_directory, self.MANIFEST)
+        if not os.path.exists(manifest_path):
+            manifest = {'segments': self.segment_paths, 'chunks': [], 'merged': [], 'replayed': False}
+            self.save_manifest(manifest)
+            return manifest
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest['segments'] != self.segment_paths:
+            raise ValueError("The work directory belongs to a different set of segments")
+        return manifest
+
+    def save_manifest(self, manifest):
+        manifest_path = os.path.join(self.work_directory, self.MANIFEST)
+        with open(f'{manifest_path}.tmp', 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(f'{manifest_path}.tmp', manifest_path)
+
+    def chunk_directory(self, chunk):
+        return os.path.join(self.work_directory, f'chunk_{chunk:06d}')
+
+    def index_chunks(self, manifest):
+        pending = [chunk for chunk in range(len(self.segment_paths)) if chunk not in manifest['chunks']]
+        if not pending:
+            return
+        started = time.perf_counter()
+        blocks = 0
+        transactions = 0
+        with ProcessPoolExecutor(self.processes) as executor:
+            futures = {}
+            for chunk in pending:
+                os.makedirs(self.chunk_directory(chunk), exist_ok=True)
+                futures[executor.submit(index_chunk, self.segment_paths[chunk], self.dictionary_path,
+                                        self.chunk_directory(chunk))] = chunk
+            for future in as_completed(futures):
+                chunk_blocks, chunk_transactions = future.result()
+                blocks += chunk_blocks
+                transactions += chunk_transactions
+                manifest['chunks'].append(futures[future])
+                self.save_manifest(manifest)
+                elapsed = time.perf_counter() - started
+                self.progress(f'indexed {len(manifest["chunks"])}/{len(self.segment_paths)} chunks, '
+                              f'{blocks / elapsed:.0f} blocks/s, {transactions / elapsed:.0f} transactions/s')
+
+    def merge_indexes(self, manifest):
+        for name in self.INDEXES:
+            if name in manifest['merged']:
+                continue
+            started = time.perf_counter()
+            entries = IndexSegment.merge(
+                [os.path.join(self.chunk_directory(chunk), f'{name}.jsonl') for chunk in range(len(self.segment_paths))],
+                os.path.join(self.output_directory, f'{name}.jsonl'),
+            )
+            manifest['merged'].append(name)
+            self.save_manifest(manifest)
+            self.progress(f'merged {name} index, {entries / (time.perf_counter() - started):.0f} entries/s')
+
+    def replay_accounts(self, manifest):
+        if manifest['replayed']:
+            return
+        started = time.perf_counter()
+        balances = {}
+        nonces = {}
+        transfers = 0
+        for chunk in range(len(self.segment_paths)):
+            with open(os.path.join(self.chunk_directory(chunk), 'transfers.json')) as transfers_file:
+                for sender, recipient, amount, nonce in json.load(transfers_file):
+                    balances[sender] = balances.get(sender, 0) - amount
+                    balances[recipient] = balances.get(recipient, 0) + amount
+                    nonces[sender] = nonce
+                    transfers += 1
+        temporary_path = os.path.join(self.output_directory, 'accounts.json.tmp')
+        with open(temporary_path, 'w') as accounts_file:
+            json.dump({'balances': balances, 'nonces': nonces}, accounts_file, sort_keys=True)
+        os.replace(temporary_path, os.path.join(self.output_directory, 'accounts.json'))
+        manifest['replayed'] = True
+        self.save_manifest(manifest)
+        self.progress(f'replayed {transfers} transfers, {transfers / (time.perf_counter() - started):.0f} transfers/s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rebuild indexes and account state from archive segments.')
+    parser.add_argument('output_directory')
+    parser.add_argument('segments', nargs='+')
+    parser.add_argument('--dictionary')
+    parser.add_argument('--processes', type=int)
+    arguments = parser.parse_args()
+    Reindexer(arguments.segments, arguments.output_directory, arguments.dictionary, arguments.processes).run()
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import time
+from collections import deque
+
+from haslo_blockchain.blockchain import Blockchain
+
+
+class WorkerState:
+    def __init__(self, name, writer):
+        self.name = name
+        self.writer = writer
+        self.ranges = []
+        self.accepted_shares = 0
+        self.rejected_shares = 0
+        self.share_times = deque()
+
+
+class WorkServer:
+    DEFAULT_RANGE_SIZE = 1000000
+    DEFAULT_SHARE_DIFFICULTY_OFFSET = 2  # shares need this many fewer leading zeros than a block
+    HASHRATE_WINDOW = 60
+    MESSAGE_FIELDS = {
+        'subscribe': {'worker': str},
+        'share': {'job_id': int, 'proof': int},
+        'range_done': {'job_id': int},
+    }
+
+    def __init__(self, last_proof, difficulty, on_solution=None, range_size=DEFAULT_RANGE_SIZE,
+                 share_difficulty=None, clock=time.monotonic):
+        self.on_solution = on_solution
+        self.range_size = range_size
+        self.fixed_share_difficulty = share_difficulty
+        self.clock = clock
+        self.workers = {}
+        self.job_id = 0
+        self.update_tip(last_proof, difficulty)
+
+    async def start(self, host, port):
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def update_tip(self, last_proof, difficulty):
+        self.job_id += 1
+        self.last_proof = last_proof
+        self.difficulty = difficulty
+        self.share_difficulty = min(
+            difficulty,
+            self.fixed_share_difficulty or max(1, difficulty - self.DEFAULT_SHARE_DIFFICULTY_OFFSET),
+        )
+        self.next_nonce = 0
+        self.submitted_proofs = set()
+        for worker in self.workers.values():
+            worker.ranges = []
+            self.send_job(worker)
+
+    def send_job(self, worker):
+        nonce_start = self.next_nonce
+        self.next_nonce += self.range_size
+        worker.ranges.append((nonce_start, self.next_nonce))
+        self.send(worker.writer, {
+            'type': 'job',
+            'job_id': self.job_id,
+            'last_proof': self.last_proof,
+            'difficulty': self.difficulty,
+            'share_difficulty': self.share_difficulty,
+            'nonce_start': nonce_start,
+            'nonce_end': self.next_nonce,
+        })
+
+    def submit_share(self, worker, job_id, proof):
+        reason = None
+        if job_id != self.job_id:
+            reason = 'stale'
+        elif not any(nonce_start <= proof < nonce_end for nonce_start, nonce_end in worker.ranges):
+            reason = 'out_of_range'
+        elif proof in self.submitted_proofs:
+            reason = 'duplicate'
+        elif not Blockchain.valid_proof(self.last_proof, proof, self.share_difficulty):
+            reason = 'invalid'
+        self.send(worker.writer, {
+            'type': 'share_result',
+            'job_id': job_id,
+            'proof': proof,
+            'accepted': reason is None,
+            'reason': reason,
+        })
+        if reason is not None:
+            worker.rejected_shares += 1
+            return False
+        self.submitted_proofs.add(proof)
+        worker.accepted_shares += 1
+        worker.share_times.append((self.clock(), 16 ** self.share_difficulty))
+        if self.on_solution is not None and Blockchain.valid_proof(self.last_proof, proof, self.difficulty):
+            self.on_solution(self.last_proof, proof, worker.name)
+        return True
+
+    def hashrate(self, name):
+        worker = self.workers[name]
+        window_start = self.clock() - self.HASHRATE_WINDOW
+        while worker.share_times and worker.share_times[0][0] < window_start:
+            worker.share_times.popleft()
+        # each accepted share stands for 16 ** share_difficulty hashes on average
+        return sum(expected_hashes for _, expected_hashes in worker.share_times) / self.HASHRATE_WINDOW
+
+    def hashrates(self):
+        return {name: self.hashrate(name) for name in self.workers}
+
+    async def handle_connection(self, reader, writer):
+        worker = None
+        try:
+            async for line in reader:
+                message = self.parse_message(line)
+                if message is None:
+                    self.send(writer, {'type': 'error', 'reason': 'malformed'})
+                elif message['type'] == 'subscribe':
+                    if worker is None:
+                        if message['worker'] in self.workers:
+                            # the name keys hashrate reporting, so a second connection may not take it over
+                            self.send(writer, {'type': 'error', 'reason': 'duplicate_worker'})
+                            await writer.drain()
+                            break
+                        worker = WorkerState(message['worker'], writer)
+                        self.workers[worker.name] = worker
+                        self.send_job(worker)
+                elif worker is None:
+                    break
+                elif message['type'] == 'share':
+                    self.submit_share(worker, message['job_id'], message['proof'])
+                elif message['type'] == 'range_done' and message['job_id'] == self.job_id:
+                    self.send_job(worker)
+                await writer.drain()
+        except ValueError:
+            # the reader refuses lines longer than its buffer limit, and the rest of the stream cannot be framed
+            self.send(writer, {'type': 'error', 'reason': 'malformed'})
+        except ConnectionError:
+            pass
+        finally:
+            if worker is not None and self.workers.get(worker.name) is worker:
+                del self.workers[worker.name]
+            writer.close()
+
+    @classmethod
+    def parse_message(cls, line):
+        try:
+            message = json.loads(line)
+        except (ValueError, RecursionError):
+            return None
+        if not isinstance(message, dict):
+            return None
+        fields = cls.MESSAGE_FIELDS.get(message.get('type'))
+        if fields is None:
+            return None
+        if not all(isinstance(message.get(field), field_type) and not isinstance(message.get(field), bool)
+                   for field, field_type in fields.items()):
+            return None
+        return message
+
+    def close(self):
+        for worker in list(self.workers.values()):
+            worker.writer.close()
+
+    @staticmethod
+    def send(writer, message):
+        writer.write(json.dumps(message).encode() + b'\n')
@@ -0,0 +1,77 @@
+import argparse
+import json
+import select
+import socket
+
+from haslo_blockchain.blockchain import Blockchain
+
+
+class Worker:
+    BATCH_SIZE = 2048  # nonces hashed between checks for a replacement job
+
+    def __init__(self, host, port, name):
+        self.host = host
+        self.port = port
+        self.name = name
+        self.accepted_shares = 0
+        self.rejected_shares = 0
+        self._connection = None
+        self._buffer = b''
+
+    def run(self):
+        with socket.create_connection((self.host, self.port)) as connection:
+            self._connection = connection
+            try:
+                self.mine()
+            except ConnectionError:
+                pass
+
+    def mine(self):
+        self.send({'type': 'subscribe', 'worker': self.name})
+        job = None
+        nonce = 0
+        while True:
+            messages = self.receive(wait=job is None)
+            if messages is None:
+                return
+            for message in messages:
+                if message['type'] == 'job':
+                    job = message
+                    nonce = job['nonce_start']
+                elif message['type'] == 'share_result':
+                    if message['accepted']:
+                        self.accepted_shares += 1
+                    else:
+                        self.rejected_shares += 1
+            if job is None:
+                continue
+            batch_end = min(nonce + self.BATCH_SIZE, job['nonce_end'])
+            for proof in range(nonce, batch_end):
+                if Blockchain.valid_proof(job['last_proof'], proof, job['share_difficulty']):
+                    self.send({'type': 'share', 'job_id': job['job_id'], 'proof': proof})
+            nonce = batch_end
+            if nonce >= job['nonce_end']:
+                self.send({'type': 'range_done', 'job_id': job['job_id']})
+                job = None
+
+    def receive(self, wait):
+        readable, _, _ = select.select([self._connection], [], [], None if wait else 0)
+        if readable:
+            data = self._connection.recv(65536)
+            if not data:
+                return None
+            self._buffer += data
+        *lines, self._buffer = self._buffer.split(b'\n')
+        return [json.loads(line) for line in lines]
+
+    def send(self, message):
+        self._connection.sendall(json.dumps(message).encode() + b'\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mine jobs handed out by a work server.')
+    parser.add_argument('host')
+    parser.add_argument('port', type=int)
+    parser.add_argument('name')
+    arguments = parser.parse_args()
+    Worker(arguments.host, arguments.port, arguments.name).run()
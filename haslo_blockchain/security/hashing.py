@@ -5,13 +5,24 @@ import json
 
 class Hashing:
     @staticmethod
-    def compute_block_hash(block):
-        block_string = json.dumps({
+    def encode_transactions(transactions):
+        return json.dumps([transaction.to_dict() for transaction in transactions], sort_keys=True).encode()
+
+    @staticmethod
+    def compute_transaction_hash(transaction_dict):
+        return hashlib.sha256(json.dumps(transaction_dict, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def compute_block_hash(block, encoded_transactions=None):
+        if encoded_transactions is None:
+            encoded_transactions = Hashing.encode_transactions(block.transactions)
+        header_string = json.dumps({
             'index': block.index,
             'timestamp': block.timestamp,
-            'transactions': [transaction.to_dict() for transaction in block.transactions],
             'previous_hash': block.previous_hash,
             'proof': block.proof,
             'difficulty': block.difficulty,
         }, sort_keys=True)
-        return hashlib.sha256(block_string.encode()).hexdigest()
+        # 'transactions' sorts after every header key, so splicing the encoded list in keeps the sort_keys layout
+        block_string = header_string[:-1].encode() + b', "transactions": ' + encoded_transactions + b'}'
+        return hashlib.sha256(block_string).hexdigest()
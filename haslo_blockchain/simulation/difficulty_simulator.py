@@ -0,0 +1,149 @@
+import argparse
+import time
+
+import numpy
+
+from haslo_blockchain.block import Block
+from haslo_blockchain.blockchain import Blockchain
+from haslo_blockchain.util.difficulty_manager import DifficultyManager
+
+
+class SimulationConfig:
+    def __init__(self, name, hashrate_schedule, initial_difficulty, block_count, node_shares=(1.0,),
+                 propagation_delay=0.0, target_block_time=DifficultyManager.DEFAULT_TARGET_BLOCK_TIME):
+        self.name = name
+        self.hashrate_schedule = sorted(hashrate_schedule)  # (start time in seconds, hashes per second)
+        self.initial_difficulty = initial_difficulty
+        self.block_count = block_count
+        self.node_shares = numpy.asarray(node_shares, dtype=float) / sum(node_shares)
+        self.propagation_delay = propagation_delay  # mean seconds until a block reaches every other node
+        self.target_block_time = target_block_time
+
+
+class SimulationResult:
+    def __init__(self, config, block_times, difficulties, orphans, elapsed):
+        self.config = config
+        self.block_times = block_times
+        self.difficulties = difficulties
+        self.orphans = orphans
+        self.elapsed = elapsed
+
+    @property
+    def orphan_rate(self):
+        return self.orphans / (self.orphans + len(self.block_times))
+
+    def percentiles(self, percentiles=(50, 90, 99)):
+        return dict(zip(percentiles, numpy.percentile(self.block_times, percentiles)))
+
+    def histogram(self, bins=20):
+        return numpy.histogram(self.block_times, bins=bins)
+
+    def summary(self):
+        percentiles = self.percentiles()
+        return {
+            'name': self.config.name,
+            'blocks': len(self.block_times),
+            'mean_block_time': float(self.block_times.mean()),
+            'p50_block_time': float(percentiles[50]),
+            'p90_block_time': float(percentiles[90]),
+            'p99_block_time': float(percentiles[99]),
+            'orphan_rate': self.orphan_rate,
+            'difficulty_changes': int(numpy.count_nonzero(numpy.diff(self.difficulties))),
+            'min_difficulty': int(self.difficulties.min()),
+            'max_difficulty': int(self.difficulties.max()),
+            'elapsed': self.elapsed,
+        }
+
+
+class DifficultySimulator:
+    SAMPLE_BATCH_SIZE = 65536
+    CHAIN_WINDOW = 10000  # blocks kept before the chain is rebased onto its last ten blocks
+
+    def __init__(self, config, seed=None):
+        self.config = config
+        self.random = numpy.random.default_rng(seed)
+
+    def run(self):
+        config = self.config
+        started = time.perf_counter()
+        blockchain = Blockchain(config.initial_difficulty, [Block(0, [], '0', 0, config.initial_difficulty, 0.0, '0')])
+        block_times = numpy.empty(config.block_count)
+        difficulties = numpy.empty(config.block_count, dtype=numpy.int64)
+        schedule = config.hashrate_schedule
+        schedule_position = 0
+        orphans = 0
+        now = 0.0
+        tip_finder = None
+        tip_propagated = 0.0
+        sample_position = self.SAMPLE_BATCH_SIZE
+        block_number = 0
+        while block_number < config.block_count:
+            if sample_position == self.SAMPLE_BATCH_SIZE:
+                intervals, finders, delays = self.sample_batch()
+                sample_position = 0
+            while schedule_position + 1 < len(schedule) and schedule[schedule_position + 1][0] <= now:
+                schedule_position += 1
+            difficulty = blockchain.difficulty
+            # a block needs 16 ** difficulty hashes on average, so discoveries form a Poisson process
+            now += intervals[sample_position] * 16 ** difficulty / schedule[schedule_position][1]
+            finder = finders[sample_position]
+            delay = delays[sample_position]
+            sample_position += 1
+            if now < tip_propagated and finder != tip_finder:
+                orphans += 1
+                continue
+            block = Block(len(blockchain.chain), [], blockchain.last_block.current_hash, 0, difficulty, now,
+                          str(block_number + 1))
+            block_times[block_number] = now - blockchain.last_block.timestamp
+            difficulties[block_number] = difficulty
+            blockchain.add_block(block, adjust_difficulty=True, target_block_time=config.target_block_time)
+            tip_finder = finder
+            tip_propagated = now + delay
+            block_number += 1
+            if len(blockchain.chain) > self.CHAIN_WINDOW:
+                blockchain = self.rebase(blockchain)
+        return SimulationResult(config, block_times, difficulties, orphans, time.perf_counter() - started)
+
+    def sample_batch(self):
+        intervals = self.random.standard_exponential(self.SAMPLE_BATCH_SIZE)
+        finders = self.random.choice(len(self.config.node_shares), self.SAMPLE_BATCH_SIZE, p=self.config.node_shares)
+        if self.config.propagation_delay > 0:
+            delays = self.random.exponential(self.config.propagation_delay, self.SAMPLE_BATCH_SIZE)
+        else:
+            delays = numpy.zeros(self.SAMPLE_BATCH_SIZE)
+        return intervals.tolist(), finders.tolist(), delays.tolist()
+
+    @staticmethod
+    def rebase(blockchain):
+        last_blocks = blockchain.chain[-10:]
+        rebased = Blockchain(blockchain.difficulty, [last_blocks[0]])
+        for block in last_blocks[1:]:
+            rebased.add_block(block)
+        return rebased
+
+
+def default_configs(block_count):
+    hashrate = 16 ** 5 / DifficultyManager.DEFAULT_TARGET_BLOCK_TIME
+    return [
+        SimulationConfig('steady hashrate', [(0, hashrate)], 5, block_count),
+        SimulationConfig('hashrate doubles', [(0, hashrate), (86400, hashrate * 2)], 5, block_count),
+        SimulationConfig('hashrate halves', [(0, hashrate), (86400, hashrate / 2)], 5, block_count),
+        SimulationConfig('ten nodes, 1s propagation', [(0, hashrate)], 5, block_count, node_shares=[1] * 10,
+                         propagation_delay=1.0),
+        SimulationConfig('ten nodes, 3s propagation', [(0, hashrate)], 5, block_count, node_shares=[1] * 10,
+                         propagation_delay=3.0),
+    ]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulate difficulty adjustment under hashrate and network changes.')
+    parser.add_argument('--blocks', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=0)
+    arguments = parser.parse_args()
+    for simulation_config in default_configs(arguments.blocks):
+        summary = DifficultySimulator(simulation_config, arguments.seed).run().summary()
+        print(f"{summary['name']:<28} mean {summary['mean_block_time']:7.2f}s  "
+              f"p50 {summary['p50_block_time']:7.2f}s  p90 {summary['p90_block_time']:7.2f}s  "
+              f"p99 {summary['p99_block_time']:7.2f}s  orphans {summary['orphan_rate']:6.2%}  "
+              f"difficulty {summary['min_difficulty']}-{summary['max_difficulty']} "
+              f"({summary['difficulty_changes']} changes)  {summary['blocks'] / summary['elapsed']:8.0f} blocks/s")
@@ -0,0 +1,154 @@
+import lzma
+import mmap
+import struct
+import zlib
+
+from haslo_blockchain.block import Block
+
+
+class ArchiveSegment:
+    MAGIC = b'HBAS'
+    VERSION = 2
+    CODEC_ZLIB = 'zlib'
+    CODEC_LZMA = 'lzma'
+    CODECS = {CODEC_ZLIB: 0, CODEC_LZMA: 1}
+    DEFAULT_BLOCKS_PER_CHUNK = 16
+    NO_DICTIONARY_ID = b'\x00' * 8
+    HEADER = struct.Struct('>4sBB8sIIQ')  # magic, version, codec, dictionary id, chunk count, block count, first index
+    CHUNK_ENTRY = struct.Struct('>QI')  # chunk offset, compressed length
+    BLOCK_ENTRY = struct.Struct('>III')  # chunk number, offset in chunk, length
+
+    def __init__(self, data, dictionary=None):
+        magic, version, codec_id, dictionary_id, chunk_count, block_count, first_index = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("Not an archive segment")
+        if dictionary_id != self.NO_DICTIONARY_ID and (dictionary is None or dictionary.dictionary_id != dictionary_id):
+            raise ValueError("Archive segment requires a different compression dictionary")
+        self.data = data
+        self.dictionary = dictionary if dictionary_id != self.NO_DICTIONARY_ID else None
+        self.codec = {value: key for key, value in self.CODECS.items()}[codec_id]
+        self.chunk_count = chunk_count
+        self.block_count = block_count
+        self.first_index = first_index
+        self._chunk_table_offset = self.HEADER.size
+        self._block_table_offset = self._chunk_table_offset + chunk_count * self.CHUNK_ENTRY.size
+        self._chunks_offset = self._block_table_offset + block_count * self.BLOCK_ENTRY.size
+        self._cached_chunk = (None, None)  # (chunk number, chunk), swapped as one so readers never mix the two
+
+    @classmethod
+    def seal(cls, blocks, dictionary=None, codec=CODEC_ZLIB, blocks_per_chunk=DEFAULT_BLOCKS_PER_CHUNK):
+        if not blocks:
+            raise ValueError("Cannot seal an empty segment")
+        if any(block.index != blocks[0].index + position for position, block in enumerate(blocks)):
+            raise ValueError("Archive segments must contain a contiguous block range")
+        if codec == cls.CODEC_LZMA and dictionary is not None:
+            raise ValueError("The lzma codec does not support preset dictionaries")
+        chunk_table = []
+        block_table = []
+        compressed_chunks = []
+        chunks_length = 0
+        for chunk_number, chunk_start in enumerate(range(0, len(blocks), blocks_per_chunk)):
+            chunk = bytearray()
+            for block in blocks[chunk_start:chunk_start + blocks_per_chunk]:
+                encoded_block = cls.encode_block(block)
+                block_table.append((chunk_number, len(chunk), len(encoded_block)))
+                chunk += encoded_block
+            compressed_chunk = cls._compress(bytes(chunk), codec, dictionary)
+            chunk_table.append((chunks_length, len(compressed_chunk)))
+            compressed_chunks.append(compressed_chunk)
+            chunks_length += len(compressed_chunk)
+        header = cls.HEADER.pack(
+            cls.MAGIC,
+            cls.VERSION,
+            cls.CODECS[codec],
+            dictionary.dictionary_id if dictionary is not None else cls.NO_DICTIONARY_ID,
+            len(chunk_table),
+            len(block_table),
+            blocks[0].index,
+        )
+        data = b''.join([
+            header,
+            b''.join(cls.CHUNK_ENTRY.pack(*entry) for entry in chunk_table),
+            b''.join(cls.BLOCK_ENTRY.pack(*entry) for entry in block_table),
+            *compressed_chunks,
+        ])
+        return cls(data, dictionary)
+
+    @classmethod
+    def open(cls, path, dictionary=None):
+        with open(path, 'rb') as segment_file:
+            data = mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, dictionary)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, path):
+        with open(path, 'wb') as segment_file:
+            segment_file.write(self.data)
+
+    @staticmethod
+    def encode_block(block):
+        return block.encode()
+
+    @property
+    def last_index(self):
+        return self.first_index + self.block_count - 1
+
+    def __len__(self):
+        return self.block_count
+
+    def __contains__(self, index):
+        return self.first_index <= index <= self.last_index
+
+    def read_encoded_block(self, index):
+        if index not in self:
+            raise IndexError(f"Block {index} is not in this segment")
+        chunk_number, offset, length = self.BLOCK_ENTRY.unpack_from(
+            self.data,
+            self._block_table_offset + (index - self.first_index) * self.BLOCK_ENTRY.size,
+        )
+        return self._chunk(chunk_number)[offset:offset + length]
+
+    def read_block(self, index):
+        return Block.decode(self.read_encoded_block(index))
+
+    def blocks(self):
+        for index in range(self.first_index, self.last_index + 1):
+            yield self.read_block(index)
+
+    def _chunk(self, chunk_number):
+        cached_chunk_number, chunk = self._cached_chunk
+        if chunk_number != cached_chunk_number:
+            offset, length = self.CHUNK_ENTRY.unpack_from(
+                self.data,
+                self._chunk_table_offset + chunk_number * self.CHUNK_ENTRY.size,
+            )
+            start = self._chunks_offset + offset
+            chunk = self._decompress(self.data[start:start + length])
+            self._cached_chunk = (chunk_number, chunk)
+        return chunk
+
+    @classmethod
+    def _compress(cls, chunk, codec, dictionary):
+        if codec == cls.CODEC_LZMA:
+            return lzma.compress(chunk)
+        if dictionary is None:
+            return zlib.compress(chunk, 9)
+        compressor = zlib.compressobj(9, zdict=dictionary.data)
+        return compressor.compress(chunk) + compressor.flush()
+
+    def _decompress(self, compressed_chunk):
+        if self.codec == self.CODEC_LZMA:
+            return lzma.decompress(compressed_chunk)
+        if self.dictionary is None:
+            return zlib.decompress(compressed_chunk)
+        decompressor = zlib.decompressobj(zdict=self.dictionary.data)
+        return decompressor.decompress(compressed_chunk) + decompressor.flush()
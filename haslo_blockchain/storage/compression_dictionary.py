@@ -0,0 +1,41 @@
+import hashlib
+import re
+from collections import Counter
+
+
+class CompressionDictionary:
+    DEFAULT_SIZE = 32 * 1024  # zlib can only reference the last 32 KiB of a preset dictionary
+    FRAGMENT_PATTERN = re.compile(rb'"[^"\\]{1,64}": ?\{?|"[^"\\]{1,64}"')
+
+    def __init__(self, data):
+        self.data = data
+        self.dictionary_id = hashlib.sha256(data).digest()[:8]
+
+    @classmethod
+    def train(cls, samples, size=DEFAULT_SIZE):
+        fragments = Counter()
+        for sample in samples:
+            fragments.update(cls.FRAGMENT_PATTERN.findall(sample))
+        # zlib reaches the end of the dictionary with the shortest distances, so the most valuable fragments go last
+        ranked = sorted(
+            (fragment for fragment, count in fragments.items() if count > 1),
+            key=lambda fragment: fragments[fragment] * len(fragment),
+            reverse=True,
+        )
+        selected = []
+        total_length = 0
+        for fragment in ranked:
+            if total_length + len(fragment) > size:
+                continue
+            selected.append(fragment)
+            total_length += len(fragment)
+        return cls(b''.join(reversed(selected)))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as dictionary_file:
+            return cls(dictionary_file.read())
+
+    def save(self, path):
+        with open(path, 'wb') as dictionary_file:
+            dictionary_file.write(self.data)
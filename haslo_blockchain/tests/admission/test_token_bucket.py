@@ -0,0 +1,28 @@
+import unittest
+
+from haslo_blockchain.admission.token_bucket import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst(self):
+        bucket = TokenBucket(rate=1, capacity=3, clock=lambda: 0)
+        self.assertTrue(bucket.consume())
+        self.assertTrue(bucket.consume())
+        self.assertTrue(bucket.consume())
+        self.assertFalse(bucket.consume())
+
+    def test_refill(self):
+        now = [0]
+        bucket = TokenBucket(rate=2, capacity=4, clock=lambda: now[0])
+        self.assertTrue(bucket.consume(4))
+        self.assertFalse(bucket.consume())
+        now[0] = 0.5
+        self.assertTrue(bucket.consume())
+        self.assertFalse(bucket.consume())
+        now[0] = 100
+        self.assertTrue(bucket.consume(4))
+        self.assertFalse(bucket.consume())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import json
+import unittest
+
+from haslo_blockchain.admission.transaction_admission import TransactionAdmission
+from haslo_blockchain.tests.fixtures import transfer_transaction, transfer_transaction_dict
+from haslo_blockchain.transaction import Transaction
+from haslo_blockchain.transaction_components.chain_id import ChainId
+
+
+def create_message(**changes):
+    return json.dumps({"type": "transaction_broadcast", "uuid": "uuid", "version": 1,
+                       "transaction": transfer_transaction_dict(**changes)}).encode()
+
+
+def create_admission(**arguments):
+    return TransactionAdmission(ChainId('main', 1), clock=lambda: 0, **arguments)
+
+
+class TestTransactionAdmission(unittest.TestCase):
+    def test_admit(self):
+        admission = create_admission()
+        self.assertIsNone(admission.admit('peer', create_message()))
+        self.assertEqual(admission.counters['received'], 1)
+        self.assertEqual(admission.counters['queued'], 1)
+        self.assertEqual(len(admission.queue), 1)
+
+    def test_rejects_by_stage(self):
+        admission = create_admission(max_message_size=1000, min_fee=10, max_gas_limit=1000,
+                                     next_nonce=lambda sender: 5, nonce_window=10)
+        self.assertEqual(admission.admit('peer', create_message(nonce=5, sender='x' * 1000)), 'size')
+        self.assertEqual(admission.admit('peer', b'not json'), 'schema')
+        self.assertEqual(admission.admit('peer', b'{"type": "block_broadcast"}'), 'schema')
+        self.assertEqual(admission.admit('peer', create_message(nonce='5')), 'schema')
+        self.assertEqual(admission.admit('peer', create_message(nonce=True)), 'schema')
+        self.assertEqual(admission.admit('peer', create_message(nonce=5, type='unknown')), 'schema')
+        self.assertEqual(admission.admit('peer', create_message(nonce=5, payload={'amount': 'many'})), 'schema')
+        self.assertIsNone(admission.admit('peer', create_message(nonce=5)))
+        self.assertEqual(admission.admit('peer', create_message(nonce=6, chain_id={'chain_id': 'test'})), 'chain_id')
+        self.assertEqual(admission.admit('peer', create_message(nonce=6, gas={'max_fee': 5, 'tip': 1})), 'gas')
+        self.assertEqual(admission.admit('peer', create_message(nonce=6, gas={'tip': 60})), 'gas')
+        self.assertEqual(admission.admit('peer', create_message(nonce=6, gas={'limit': 1001})), 'gas')
+        self.assertEqual(admission.admit('peer', create_message(nonce=6, gas={'limit': 0})), 'gas')
+        self.assertEqual(admission.admit('peer', create_message(nonce=4)), 'nonce')
+        self.assertEqual(admission.admit('peer', create_message(nonce=15)), 'nonce')
+        self.assertEqual(admission.admit('peer', create_message(nonce=5)), 'duplicate')
+        self.assertEqual(admission.counters['schema'], 6)
+        self.assertEqual(admission.counters['gas'], 4)
+        self.assertEqual(admission.counters['queued'], 1)
+
+    def test_missing_signature_fields(self):
+        admission = create_admission()
+        message = json.loads(create_message())
+        del message['transaction']['signature']['r']
+        self.assertEqual(admission.admit('peer', json.dumps(message).encode()), 'schema')
+
+    def test_deeply_nested_message(self):
+        admission = create_admission()
+        self.assertEqual(admission.admit('peer', b'[' * 5000), 'schema')
+        self.assertEqual(admission.admit('peer', b'{"type": "transaction_broadcast", "transaction": ' + b'[' * 5000),
+                         'schema')
+        self.assertEqual(admission.counters['schema'], 2)
+
+    def test_rejects_unknown_fields(self):
+        admission = create_admission()
+        self.assertIsNone(admission.admit('peer', create_message()))
+        self.assertEqual(admission.admit('peer', create_message(junk='junk')), 'schema')
+        self.assertEqual(admission.admit('peer', create_message(signature={'junk': 'junk'})), 'schema')
+        self.assertEqual(admission.admit('peer', create_message(payload={'junk': 'junk'})), 'schema')
+        self.assertEqual(admission.admit('peer', create_message(gas={'junk': 1})), 'schema')
+        self.assertEqual(admission.admit('peer', create_message()), 'duplicate')
+        _, _, transaction_hash, _ = admission.queue[0]
+        self.assertEqual(transaction_hash, transfer_transaction().transaction_hash)
+        self.assertEqual(len(admission.drain(lambda transaction_dict: True)), 1)
+
+    def test_rate_limit_per_peer(self):
+        admission = create_admission(peer_rate=1, peer_burst=2)
+        self.assertIsNone(admission.admit('first', create_message(nonce=1)))
+        self.assertIsNone(admission.admit('first', create_message(nonce=2)))
+        self.assertEqual(admission.admit('first', create_message(nonce=3)), 'rate_limit')
+        self.assertIsNone(admission.admit('second', create_message(nonce=3)))
+        self.assertEqual(admission.counters['rate_limit'], 1)
+
+    def test_duplicate_window(self):
+        admission = create_admission(seen_hashes=2)
+        for nonce in (1, 2, 3):
+            admission.admit('peer', create_message(nonce=nonce))
+        self.assertIsNone(admission.admit('peer', create_message(nonce=1)))
+        self.assertEqual(admission.admit('peer', create_message(nonce=3)), 'duplicate')
+
+    def test_load_shedding(self):
+        admission = create_admission(queue_size=2)
+        self.assertIsNone(admission.admit('peer', create_message(nonce=1, gas={'tip': 5})))
+        self.assertIsNone(admission.admit('peer', create_message(nonce=2, gas={'tip': 3})))
+        self.assertEqual(admission.admit('peer', create_message(nonce=3, gas={'tip': 3})), 'queue')
+        self.assertIsNone(admission.admit('peer', create_message(nonce=4, gas={'tip': 4})))
+        self.assertEqual(admission.counters['shed'], 1)
+        self.assertEqual([entry[3]['nonce'] for entry in admission.queue], [4, 1])
+
+    def test_rejected_and_shed_transactions_are_not_seen(self):
+        admission = create_admission(queue_size=1)
+        self.assertIsNone(admission.admit('peer', create_message(nonce=1, gas={'tip': 3})))
+        self.assertEqual(admission.admit('peer', create_message(nonce=2, gas={'tip': 3})), 'queue')
+        self.assertIsNone(admission.admit('peer', create_message(nonce=3, gas={'tip': 5})))
+        # nonce 2 was never queued and nonce 1 was shed, so neither is reported as a duplicate
+        self.assertEqual(admission.admit('peer', create_message(nonce=1, gas={'tip': 3})), 'queue')
+        self.assertEqual(admission.admit('peer', create_message(nonce=2, gas={'tip': 3})), 'queue')
+        admission.drain(lambda transaction_dict: True)
+        self.assertIsNone(admission.admit('peer', create_message(nonce=2, gas={'tip': 3})))
+        self.assertEqual(admission.admit('peer', create_message(nonce=3, gas={'tip': 5})), 'duplicate')
+
+    def test_drain(self):
+        admission = create_admission()
+        admission.admit('peer', create_message(nonce=1, gas={'tip': 1}))
+        admission.admit('peer', create_message(nonce=2, gas={'tip': 9}))
+        admission.admit('peer', create_message(nonce=3, gas={'tip': 1}))
+        admission.admit('peer', create_message(nonce=4, gas={'tip': 5}))
+        transactions = admission.drain(lambda transaction_dict: transaction_dict['nonce'] != 4, limit=3)
+        self.assertTrue(all(isinstance(transaction, Transaction) for transaction in transactions))
+        self.assertEqual([transaction.nonce for transaction in transactions], [2, 1])
+        self.assertEqual(admission.counters['signature'], 1)
+        self.assertEqual(admission.counters['accepted'], 2)
+        self.assertEqual([transaction.nonce for transaction in admission.drain(lambda transaction_dict: True)], [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
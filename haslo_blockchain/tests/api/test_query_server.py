@@ -0,0 +1,124 @@
+import asyncio
+import json
+import unittest
+
+from haslo_blockchain.api.query_server import QueryServer
+from haslo_blockchain.block import Block
+from haslo_blockchain.blockchain import Blockchain
+from haslo_blockchain.tests.fixtures import transfer_transaction
+
+
+def create_blockchain(length):
+    transaction = transfer_transaction()
+    blockchain = Blockchain(3, [Block(0, [], '0', 0, 3, 1638307200, 'hash_0')])
+    for index in range(1, length):
+        blockchain.add_block(Block(index, [transaction], f'hash_{index - 1}', index, 3, 1638307200 + index,
+                                   f'hash_{index}'))
+    return blockchain
+
+
+def split_response(response):
+    head, _, body = response.partition(b'\r\n\r\n')
+    lines = head.decode().split('\r\n')
+    headers = dict(line.split(': ', 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, json.loads(body) if body else None
+
+
+class TestQueryServer(unittest.TestCase):
+    def test_block_by_index(self):
+        server = QueryServer(create_blockchain(5))
+        status, headers, data = split_response(server.respond('/blocks/2'))
+        self.assertEqual(status, 200)
+        self.assertEqual(data['index'], 2)
+        self.assertEqual(data['current_hash'], 'hash_2')
+        self.assertEqual(headers['ETag'], '"hash_2"')
+
+    def test_block_by_hash(self):
+        blockchain = create_blockchain(5)
+        server = QueryServer(blockchain)
+        self.assertEqual(split_response(server.respond('/blocks/hash/hash_3'))[2]['index'], 3)
+        blockchain.add_block(Block(5, [], 'hash_4', 5, 3, 1638307205, 'hash_5'))
+        self.assertEqual(split_response(server.respond('/blocks/hash/hash_5'))[2]['index'], 5)
+        self.assertEqual(split_response(server.respond('/blocks/hash/unknown'))[0], 404)
+
+    def test_transaction(self):
+        server = QueryServer(create_blockchain(5))
+        status, headers, data = split_response(server.respond('/blocks/2/transactions/0'))
+        self.assertEqual(status, 200)
+        self.assertEqual(data['payload'], {"recipient": "recipient_address", "amount": 100})
+        self.assertEqual(headers['ETag'], '"hash_2/0"')
+        self.assertEqual(split_response(server.respond('/blocks/2/transactions/1'))[0], 404)
+
+    def test_tip_and_difficulty(self):
+        blockchain = create_blockchain(5)
+        server = QueryServer(blockchain)
+        status, headers, data = split_response(server.respond('/tip'))
+        self.assertEqual(data['index'], 4)
+        self.assertNotIn('ETag', headers)
+        self.assertEqual(split_response(server.respond('/difficulty'))[2], {'difficulty': 3})
+        blockchain.difficulty = 4
+        self.assertEqual(split_response(server.respond('/difficulty'))[2], {'difficulty': 4})
+
+    def test_caches_finalized_blocks_only(self):
+        blockchain = create_blockchain(5)
+        server = QueryServer(blockchain)
+        first_response = server.respond('/blocks/3')
+        self.assertIs(server.respond('/blocks/3'), first_response)
+        self.assertIn('/blocks/3', server.cache)
+        server.respond('/blocks/4')
+        self.assertNotIn('/blocks/4', server.cache)
+        blockchain.add_block(Block(5, [], 'hash_4', 5, 3, 1638307205, 'hash_5'))
+        server.respond('/blocks/4')
+        self.assertIn('/blocks/4', server.cache)
+
+    def test_equivalent_paths_share_cache_entry(self):
+        server = QueryServer(create_blockchain(5))
+        first_response = server.respond('/blocks/3')
+        self.assertIs(server.respond('/blocks/0003'), first_response)
+        self.assertIs(server.respond('/blocks/3/'), first_response)
+        self.assertEqual(split_response(server.respond('/blocks/02/transactions/00'))[0], 200)
+        self.assertEqual(len(server.cache), 2)
+
+    def test_finality_depth(self):
+        server = QueryServer(create_blockchain(5), finality_depth=3)
+        self.assertNotIn('ETag', split_response(server.respond('/blocks/2'))[1])
+        self.assertIn('ETag', split_response(server.respond('/blocks/1'))[1])
+
+    def test_not_modified(self):
+        server = QueryServer(create_blockchain(5))
+        status, _, data = split_response(server.respond('/blocks/2', '"hash_2"'))
+        self.assertEqual(status, 304)
+        self.assertIsNone(data)
+        self.assertEqual(split_response(server.respond('/blocks/2', '"other"'))[0], 200)
+
+    def test_not_found(self):
+        server = QueryServer(create_blockchain(5))
+        self.assertEqual(split_response(server.respond('/blocks/5'))[0], 404)
+        self.assertEqual(split_response(server.respond('/unknown'))[0], 404)
+        self.assertEqual(split_response(server.respond('/blocks/\u00b2'))[0], 404)
+        self.assertEqual(split_response(server.respond('/blocks/2/transactions/\u0661'))[0], 404)
+        self.assertEqual(split_response(server.respond('/blocks/' + '1' * 5000))[0], 404)
+        self.assertEqual(split_response(server.respond('/blocks/2/transactions/' + '1' * 5000))[0], 404)
+
+    def test_connection(self):
+        async def run():
+            server = QueryServer(create_blockchain(5))
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'GET /blocks/1 HTTP/1.1\r\nHost: localhost\r\n\r\n')
+            writer.write(b'POST /blocks/1 HTTP/1.1\r\nConnection: close\r\n\r\n')
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return response
+
+        response = asyncio.run(run())
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 OK\r\n'))
+        self.assertIn(b'HTTP/1.1 405 Method Not Allowed\r\n', response)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from haslo_blockchain.api.response_cache import CachedResponse, ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = ResponseCache(max_bytes=100)
+        cached_response = CachedResponse('"etag"', b'response', b'not modified')
+        self.assertIsNone(cache.get('/blocks/1'))
+        cache.put('/blocks/1', cached_response)
+        self.assertIs(cache.get('/blocks/1'), cached_response)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.size, len(b'response') + len(b'not modified'))
+
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(max_bytes=30)
+        cache.put('/blocks/1', CachedResponse('"1"', b'x' * 10, b''))
+        cache.put('/blocks/2', CachedResponse('"2"', b'x' * 10, b''))
+        cache.get('/blocks/1')
+        cache.put('/blocks/3', CachedResponse('"3"', b'x' * 15, b''))
+        self.assertIn('/blocks/1', cache)
+        self.assertNotIn('/blocks/2', cache)
+        self.assertIn('/blocks/3', cache)
+        self.assertEqual(cache.size, 25)
+
+    def test_replace(self):
+        cache = ResponseCache(max_bytes=30)
+        cache.put('/blocks/1', CachedResponse('"1"', b'x' * 10, b''))
+        cache.put('/blocks/1', CachedResponse('"1"', b'x' * 5, b''))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.size, 5)
+
+    def test_oversized_response_is_not_cached(self):
+        cache = ResponseCache(max_bytes=0)
+        cache.put('/blocks/1', CachedResponse('"1"', b'response', b''))
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import copy
+
+from haslo_blockchain.transaction import Transaction
+
+TRANSFER_TRANSACTION_DICT = {
+    "type": "transfer",
+    "sender": "sender_address",
+    "payload": {"recipient": "recipient_address", "amount": 100},
+    "nonce": 1,
+    "chain_id": {"chain_id": "main", "version": 1},
+    "gas": {"tip": 1, "max_fee": 50, "limit": 100},
+    "signature": {"type": "ECDSA", "r": "r_value", "s": "s_value", "v": 27, "public_key": "public_key"},
+}
+
+
+def transfer_transaction_dict(**changes):
+    # nested fields such as payload or gas are updated rather than replaced
+    transaction_dict = copy.deepcopy(TRANSFER_TRANSACTION_DICT)
+    for key, value in changes.items():
+        if isinstance(value, dict):
+            transaction_dict[key].update(value)
+        else:
+            transaction_dict[key] = value
+    return transaction_dict
+
+
+def transfer_transaction(**changes):
+    return Transaction.from_dict(transfer_transaction_dict(**changes))
+
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+from haslo_blockchain.indexing.index_segment import IndexSegment
+
+
+class TestIndexSegment(unittest.TestCase):
+    def test_write_and_read(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'segment.jsonl')
+            IndexSegment.write(path, [('b', 1), ('a', [2, 0]), ('c', 3)])
+            self.assertEqual(list(IndexSegment.read(path)), [('a', [2, 0]), ('b', 1), ('c', 3)])
+            self.assertFalse(os.path.exists(f'{path}.tmp'))
+
+    def test_merge(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first_path = os.path.join(directory, 'first.jsonl')
+            second_path = os.path.join(directory, 'second.jsonl')
+            output_path = os.path.join(directory, 'output.jsonl')
+            IndexSegment.write(first_path, [('a', 1), ('c', 1), ('b', 1)])
+            IndexSegment.write(second_path, [('b', 2), ('d', 2), ('a', 2)])
+            self.assertEqual(IndexSegment.merge([first_path, second_path], output_path), 6)
+            self.assertEqual(list(IndexSegment.read(output_path)), [
+                ('a', 1), ('a', 2), ('b', 1), ('b', 2), ('c', 1), ('d', 2),
+            ])
+
+    def test_multi_pass_merge(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for number in range(10):
+                path = os.path.join(directory, f'segment_{number}.jsonl')
+                IndexSegment.write(path, [(f'key_{key}', number) for key in range(number, 20, 3)])
+                paths.append(path)
+            output_path = os.path.join(directory, 'output.jsonl')
+            expected = [entry for path in paths for entry in IndexSegment.read(path)]
+            expected.sort(key=lambda entry: entry[0])
+            self.assertEqual(IndexSegment.merge(paths, output_path, fan_in=3), len(expected))
+            self.assertEqual(list(IndexSegment.read(output_path)), expected)
+            self.assertEqual(sorted(os.listdir(directory)), sorted([os.path.basename(path) for path in paths] +
+                                                                   ['output.jsonl']))
+            with self.assertRaises(ValueError):
+                IndexSegment.merge(paths, output_path, fan_in=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
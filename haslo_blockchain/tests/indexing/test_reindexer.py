@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from haslo_blockchain.block import Block
+from haslo_blockchain.indexing.index_segment import IndexSegment
+from haslo_blockchain.indexing.reindexer import Reindexer
+from haslo_blockchain.storage.archive_segment import ArchiveSegment
+from haslo_blockchain.storage.compression_dictionary import CompressionDictionary
+from haslo_blockchain.tests.fixtures import transfer_transaction
+
+
+def create_transaction(sender, recipient, amount, nonce):
+    return transfer_transaction(sender=sender, payload={"recipient": recipient, "amount": amount}, nonce=nonce)
+
+
+def create_blocks(count):
+    return [
+        Block(index, [create_transaction('alice', 'bob', 10, index), create_transaction('bob', 'carol', 3, index)],
+              f'hash_{index - 1}', index, 1 + index // 10, 1638307200 + index, f'hash_{index}')
+        for index in range(count)
+    ]
+
+
+class TestReindexer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.output_directory = os.path.join(self.directory, 'output')
+        self.blocks = create_blocks(30)
+        self.dictionary = CompressionDictionary.train(block.encode() for block in self.blocks)
+        self.dictionary_path = os.path.join(self.directory, 'dictionary.bin')
+        self.dictionary.save(self.dictionary_path)
+        self.segment_paths = []
+        for first_index in (20, 0, 10):
+            path = os.path.join(self.directory, f'segment_{first_index}.hbas')
+            ArchiveSegment.seal(self.blocks[first_index:first_index + 10], self.dictionary).write(path)
+            self.segment_paths.append(path)
+        self.messages = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create_reindexer(self):
+        return Reindexer(self.segment_paths, self.output_directory, self.dictionary_path, processes=2,
+                         progress=self.messages.append)
+
+    def read_index(self, name):
+        return list(IndexSegment.read(os.path.join(self.output_directory, f'{name}.jsonl')))
+
+    def test_orders_segments(self):
+        reindexer = self.create_reindexer()
+        self.assertEqual([os.path.basename(path) for path in reindexer.segment_paths],
+                         ['segment_0.hbas', 'segment_10.hbas', 'segment_20.hbas'])
+        self.assertEqual(reindexer.block_count, 30)
+
+    def test_rejects_gaps(self):
+        os.remove(self.segment_paths[2])
+        with self.assertRaises(ValueError):
+            Reindexer(self.segment_paths[:2], self.output_directory, self.dictionary_path)
+
+    def test_run(self):
+        self.create_reindexer().run()
+        transactions = self.read_index('transactions')
+        self.assertEqual(len(transactions), 60)
+        self.assertEqual([entry[0] for entry in transactions], sorted(entry[0] for entry in transactions))
+        transaction = self.blocks[12].transaction(1)
+        self.assertIn((transaction.transaction_hash, [12, 1]), transactions)
+        addresses = self.read_index('addresses')
+        self.assertEqual([location for address, location in addresses if address == 'alice'],
+                         [[index, 0] for index in range(30)])
+        self.assertEqual(len([address for address, _ in addresses if address == 'bob']), 60)
+        self.assertEqual(self.read_index('difficulty'), [(block.index, block.difficulty) for block in self.blocks])
+        with open(os.path.join(self.output_directory, 'accounts.json')) as accounts_file:
+            accounts = json.load(accounts_file)
+        self.assertEqual(accounts['balances'], {'alice': -300, 'bob': 210, 'carol': 90})
+        self.assertEqual(accounts['nonces'], {'alice': 29, 'bob': 29})
+        self.assertTrue(any(message.startswith('indexed 3/3 chunks') for message in self.messages))
+
+    def test_resume(self):
+        reindexer = self.create_reindexer()
+        os.makedirs(reindexer.work_directory)
+        manifest = reindexer.load_manifest()
+        reindexer.index_chunks(manifest)
+        manifest['chunks'].remove(1)
+        shutil.rmtree(reindexer.chunk_directory(1))
+        reindexer.save_manifest(manifest)
+        self.messages.clear()
+        manifest = self.create_reindexer().run()
+        self.assertEqual(sorted(manifest['chunks']), [0, 1, 2])
+        self.assertEqual([message for message in self.messages if message.startswith('indexed')][0][:18],
+                         'indexed 3/3 chunks')
+        self.assertEqual(len(self.read_index('transactions')), 60)
+        self.messages.clear()
+        self.create_reindexer().run()
+        self.assertEqual(len(self.messages), 1)
+
+    def test_rejects_foreign_work_directory(self):
+        self.create_reindexer().run()
+        with self.assertRaises(ValueError):
+            Reindexer(self.segment_paths[1:], self.output_directory, self.dictionary_path).run()
+
+
+if __name__ == '__main__':
+    unittest.main()
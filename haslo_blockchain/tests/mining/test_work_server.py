@@ -0,0 +1,201 @@
+import asyncio
+import json
+import multiprocessing
+import unittest
+from unittest.mock import Mock
+
+from haslo_blockchain.blockchain import Blockchain
+from haslo_blockchain.mining.work_server import WorkerState, WorkServer
+from haslo_blockchain.mining.worker import Worker
+
+
+def find_proof(last_proof, difficulty, start=0):
+    proof = start
+    while not Blockchain.valid_proof(last_proof, proof, difficulty):
+        proof += 1
+    return proof
+
+
+def sent_messages(writer):
+    return [json.loads(call.args[0]) for call in writer.write.call_args_list]
+
+
+class TestWorkServer(unittest.TestCase):
+    def create_worker(self, server, name='worker'):
+        worker = WorkerState(name, Mock())
+        server.workers[name] = worker
+        server.send_job(worker)
+        return worker
+
+    def test_hands_out_disjoint_ranges(self):
+        server = WorkServer(last_proof=100, difficulty=3, range_size=1000)
+        first_worker = self.create_worker(server, 'first')
+        second_worker = self.create_worker(server, 'second')
+        first_job = sent_messages(first_worker.writer)[0]
+        second_job = sent_messages(second_worker.writer)[0]
+        self.assertEqual(first_job['type'], 'job')
+        self.assertEqual(first_job['last_proof'], 100)
+        self.assertEqual(first_job['difficulty'], 3)
+        self.assertEqual(first_job['share_difficulty'], 1)
+        self.assertEqual((first_job['nonce_start'], first_job['nonce_end']), (0, 1000))
+        self.assertEqual((second_job['nonce_start'], second_job['nonce_end']), (1000, 2000))
+
+    def test_share_difficulty(self):
+        self.assertEqual(WorkServer(0, 6).share_difficulty, 4)
+        self.assertEqual(WorkServer(0, 1).share_difficulty, 1)
+        self.assertEqual(WorkServer(0, 6, share_difficulty=2).share_difficulty, 2)
+        self.assertEqual(WorkServer(0, 1, share_difficulty=2).share_difficulty, 1)
+
+    def test_accepts_shares_and_reports_solutions(self):
+        on_solution = Mock()
+        server = WorkServer(last_proof=7, difficulty=2, on_solution=on_solution, share_difficulty=1,
+                            range_size=100000, clock=lambda: 1000)
+        worker = self.create_worker(server)
+        solution = find_proof(7, 2)
+        self.assertTrue(server.submit_share(worker, server.job_id, solution))
+        on_solution.assert_called_once_with(7, solution, 'worker')
+        self.assertEqual(worker.accepted_shares, 1)
+        self.assertEqual(server.hashrate('worker'), 16 / WorkServer.HASHRATE_WINDOW)
+        self.assertEqual(sent_messages(worker.writer)[-1]['accepted'], True)
+
+    def test_rejects_bad_shares(self):
+        server = WorkServer(last_proof=7, difficulty=3, share_difficulty=1, range_size=100000)
+        worker = self.create_worker(server)
+        share = find_proof(7, 1)
+        invalid = next(proof for proof in range(1000) if not Blockchain.valid_proof(7, proof, 1))
+        self.assertFalse(server.submit_share(worker, server.job_id, invalid))
+        self.assertFalse(server.submit_share(worker, server.job_id, 100000 + find_proof(7, 1, 100000)))
+        self.assertTrue(server.submit_share(worker, server.job_id, share))
+        self.assertFalse(server.submit_share(worker, server.job_id, share))
+        reasons = [message['reason'] for message in sent_messages(worker.writer)[1:]]
+        self.assertEqual(reasons, ['invalid', 'out_of_range', None, 'duplicate'])
+        self.assertEqual(worker.rejected_shares, 3)
+
+    def test_update_tip_invalidates_jobs(self):
+        server = WorkServer(last_proof=7, difficulty=3, share_difficulty=1, range_size=100000)
+        worker = self.create_worker(server)
+        old_job_id = server.job_id
+        share = find_proof(7, 1)
+        server.update_tip(8, 4)
+        job = sent_messages(worker.writer)[-1]
+        self.assertEqual(job['job_id'], old_job_id + 1)
+        self.assertEqual(job['last_proof'], 8)
+        self.assertEqual(job['difficulty'], 4)
+        self.assertEqual(job['nonce_start'], 0)
+        self.assertFalse(server.submit_share(worker, old_job_id, share))
+        self.assertEqual(sent_messages(worker.writer)[-1]['reason'], 'stale')
+
+    def test_hashrate_window(self):
+        now = [0]
+        server = WorkServer(last_proof=7, difficulty=3, share_difficulty=1, range_size=100000, clock=lambda: now[0])
+        worker = self.create_worker(server)
+        server.submit_share(worker, server.job_id, find_proof(7, 1))
+        now[0] = WorkServer.HASHRATE_WINDOW + 1
+        server.submit_share(worker, server.job_id, find_proof(7, 1, find_proof(7, 1) + 1))
+        self.assertEqual(server.hashrates(), {'worker': 16 / WorkServer.HASHRATE_WINDOW})
+
+    def test_parse_message(self):
+        self.assertEqual(WorkServer.parse_message(b'{"type": "share", "job_id": 1, "proof": 5}\n'),
+                         {'type': 'share', 'job_id': 1, 'proof': 5})
+        self.assertIsNone(WorkServer.parse_message(b'{"type": "share", "job_id": 1, "proof": "5"}\n'))
+        self.assertIsNone(WorkServer.parse_message(b'{"type": "share", "job_id": true, "proof": 5}\n'))
+        self.assertIsNone(WorkServer.parse_message(b'{"type": "subscribe"}\n'))
+        self.assertIsNone(WorkServer.parse_message(b'{"type": "unknown"}\n'))
+        self.assertIsNone(WorkServer.parse_message(b'[1, 2]\n'))
+        self.assertIsNone(WorkServer.parse_message(b'not json\n'))
+        self.assertIsNone(WorkServer.parse_message(b'[' * 5000 + b'\n'))
+
+    def test_connection_rejections(self):
+        async def run():
+            server = WorkServer(last_proof=7, difficulty=3, share_difficulty=1, range_size=100000)
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'{"type": "subscribe", "worker": "worker"}\n')
+            job = json.loads(await reader.readline())
+            writer.write(b'{"type": "share", "job_id": 1, "proof": "5"}\n[]\n')
+            errors = [json.loads(await reader.readline()) for _ in range(2)]
+            writer.write(json.dumps({'type': 'share', 'job_id': job['job_id'], 'proof': find_proof(7, 1)}).encode()
+                         + b'\n')
+            share_result = json.loads(await reader.readline())
+            other_reader, other_writer = await asyncio.open_connection('127.0.0.1', port)
+            other_writer.write(b'{"type": "subscribe", "worker": "worker"}\n')
+            duplicate = json.loads(await other_reader.readline())
+            other_closed = await other_reader.read() == b''
+            workers = dict(server.workers)
+            writer.close()
+            other_writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return job, errors, share_result, duplicate, other_closed, workers
+
+        job, errors, share_result, duplicate, other_closed, workers = asyncio.run(run())
+        self.assertEqual(job['type'], 'job')
+        self.assertEqual(errors, [{'type': 'error', 'reason': 'malformed'}] * 2)
+        self.assertTrue(share_result['accepted'])
+        self.assertEqual(duplicate, {'type': 'error', 'reason': 'duplicate_worker'})
+        self.assertTrue(other_closed)
+        self.assertEqual(workers['worker'].accepted_shares, 1)
+
+    def test_over_long_line(self):
+        async def run():
+            server = WorkServer(last_proof=7, difficulty=3)
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'[' * 5000 + b'\n')
+            nested = json.loads(await reader.readline())
+            writer.write(b'x' * 100000 + b'\n')
+            over_long = json.loads(await reader.readline())
+            closed = await reader.read() == b''
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return nested, over_long, closed
+
+        nested, over_long, closed = asyncio.run(run())
+        self.assertEqual(nested, {'type': 'error', 'reason': 'malformed'})
+        self.assertEqual(over_long, {'type': 'error', 'reason': 'malformed'})
+        self.assertTrue(closed)
+
+    def test_worker_processes(self):
+        async def run():
+            solutions = []
+
+            def on_solution(last_proof, proof, name):
+                solutions.append((last_proof, proof, name))
+                server.update_tip(proof, 2)
+                if len(solutions) >= 4:
+                    server.close()
+
+            server = WorkServer(last_proof=0, difficulty=2, on_solution=on_solution, share_difficulty=1,
+                                range_size=500)
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            context = multiprocessing.get_context('spawn')
+            processes = [
+                context.Process(target=Worker('127.0.0.1', port, f'worker_{number}').run)
+                for number in range(2)
+            ]
+            for process in processes:
+                process.start()
+            while len(solutions) < 4:
+                await asyncio.sleep(0.05)
+            listener.close()
+            await listener.wait_closed()
+            for process in processes:
+                await asyncio.get_running_loop().run_in_executor(None, process.join, 10)
+            return solutions, processes
+
+        solutions, processes = asyncio.run(run())
+        last_proof = 0
+        for solution_last_proof, proof, _ in solutions:
+            self.assertEqual(solution_last_proof, last_proof)
+            self.assertTrue(Blockchain.valid_proof(last_proof, proof, 2))
+            last_proof = proof
+        for process in processes:
+            self.assertEqual(process.exitcode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
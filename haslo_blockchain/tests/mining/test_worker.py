@@ -0,0 +1,49 @@
+import asyncio
+import json
+import unittest
+
+from haslo_blockchain.blockchain import Blockchain
+from haslo_blockchain.mining.worker import Worker
+
+
+class TestWorker(unittest.TestCase):
+    def test_initialization(self):
+        worker = Worker('127.0.0.1', 1234, 'worker')
+        self.assertEqual(worker.host, '127.0.0.1')
+        self.assertEqual(worker.port, 1234)
+        self.assertEqual(worker.name, 'worker')
+
+    def test_mines_assigned_range(self):
+        async def run():
+            received = []
+
+            async def handle_connection(reader, writer):
+                received.append(json.loads(await reader.readline()))
+                job = {'type': 'job', 'job_id': 1, 'last_proof': 5, 'difficulty': 2, 'share_difficulty': 1,
+                       'nonce_start': 100, 'nonce_end': 300}
+                writer.write(json.dumps(job).encode() + b'\n')
+                while True:
+                    message = json.loads(await reader.readline())
+                    received.append(message)
+                    if message['type'] == 'range_done':
+                        break
+                    writer.write(json.dumps({'type': 'share_result', 'accepted': True}).encode() + b'\n')
+                writer.close()
+
+            listener = await asyncio.start_server(handle_connection, '127.0.0.1', 0)
+            worker = Worker('127.0.0.1', listener.sockets[0].getsockname()[1], 'worker')
+            await asyncio.get_running_loop().run_in_executor(None, worker.run)
+            listener.close()
+            await listener.wait_closed()
+            return received, worker
+
+        received, worker = asyncio.run(run())
+        expected_shares = [proof for proof in range(100, 300) if Blockchain.valid_proof(5, proof, 1)]
+        self.assertEqual(received[0], {'type': 'subscribe', 'worker': 'worker'})
+        self.assertEqual([message['proof'] for message in received[1:-1]], expected_shares)
+        self.assertEqual(received[-1], {'type': 'range_done', 'job_id': 1})
+        self.assertLessEqual(worker.accepted_shares, len(expected_shares))
+
+
+if __name__ == '__main__':
+    unittest.main()
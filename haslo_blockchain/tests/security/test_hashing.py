@@ -1,7 +1,14 @@
+import hashlib
+import json
 import unittest
 from haslo_blockchain.security.hashing import Hashing
 
 
+class MockTransaction:
+    def to_dict(self):
+        return {"mock": "transaction", "amount": 1}
+
+
 class TestHashing(unittest.TestCase):
     def test_compute_block_hash(self):
         class MockTransaction:
@@ -21,6 +28,40 @@ class TestHashing(unittest.TestCase):
         self.assertIsNotNone(block_hash)
         self.assertEqual(len(block_hash), 64)  # SHA-256 hash length is 64 characters
 
+    def test_compute_block_hash_matches_full_encoding(self):
+        class MockBlock:
+            index = 1
+            timestamp = 1234567890.5
+            transactions = [MockTransaction(), MockTransaction()]
+            previous_hash = "previous_hash"
+            proof = 42
+            difficulty = 1
+
+        block = MockBlock()
+        block_string = json.dumps({
+            'index': block.index,
+            'timestamp': block.timestamp,
+            'transactions': [transaction.to_dict() for transaction in block.transactions],
+            'previous_hash': block.previous_hash,
+            'proof': block.proof,
+            'difficulty': block.difficulty,
+        }, sort_keys=True)
+        expected_hash = hashlib.sha256(block_string.encode()).hexdigest()
+        self.assertEqual(Hashing.compute_block_hash(block), expected_hash)
+        encoded_transactions = Hashing.encode_transactions(block.transactions)
+        block.transactions = None
+        self.assertEqual(Hashing.compute_block_hash(block, encoded_transactions), expected_hash)
+
+    def test_compute_transaction_hash(self):
+        transaction_hash = Hashing.compute_transaction_hash({"b": 1, "a": 2})
+        self.assertEqual(len(transaction_hash), 64)
+        self.assertEqual(transaction_hash, Hashing.compute_transaction_hash({"a": 2, "b": 1}))
+        self.assertNotEqual(transaction_hash, Hashing.compute_transaction_hash({"a": 2, "b": 2}))
+
+    def test_encode_transactions(self):
+        encoded_transactions = Hashing.encode_transactions([MockTransaction()])
+        self.assertEqual(encoded_transactions, b'[{"amount": 1, "mock": "transaction"}]')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from haslo_blockchain.simulation.difficulty_simulator import DifficultySimulator, SimulationConfig, default_configs
+
+
+class TestDifficultySimulator(unittest.TestCase):
+    def test_config(self):
+        config = SimulationConfig('config', [(100, 2.0), (0, 1.0)], 3, 10, node_shares=[1, 3])
+        self.assertEqual(config.hashrate_schedule, [(0, 1.0), (100, 2.0)])
+        self.assertEqual(list(config.node_shares), [0.25, 0.75])
+        self.assertEqual(config.target_block_time, 10)
+
+    def test_steady_hashrate_without_propagation_delay(self):
+        config = SimulationConfig('steady', [(0, 16 ** 3 / 10)], 3, 500)
+        result = DifficultySimulator(config, seed=1).run()
+        self.assertEqual(len(result.block_times), 500)
+        self.assertEqual(result.orphans, 0)
+        self.assertEqual(result.orphan_rate, 0)
+        self.assertTrue((result.block_times > 0).all())
+        self.assertEqual(result.difficulties[0], 3)
+
+    def test_high_hashrate_raises_difficulty(self):
+        config = SimulationConfig('fast', [(0, 16 ** 3 * 100)], 3, 50)
+        result = DifficultySimulator(config, seed=1).run()
+        self.assertGreater(result.difficulties.max(), 3)
+
+    def test_hashrate_schedule(self):
+        config = SimulationConfig('drop', [(0, 16 ** 3 / 10), (1000, 16 ** 3 / 1000)], 3, 200)
+        result = DifficultySimulator(config, seed=1).run()
+        self.assertLess(result.difficulties.min(), 3)
+
+    def test_propagation_delay_causes_orphans(self):
+        config = SimulationConfig('slow network', [(0, 16 ** 3 / 10)], 3, 500, node_shares=[1] * 10,
+                                  propagation_delay=5.0)
+        result = DifficultySimulator(config, seed=1).run()
+        self.assertGreater(result.orphans, 0)
+        self.assertLess(result.orphan_rate, 1)
+
+    def test_rebase(self):
+        config = SimulationConfig('long', [(0, 16 ** 3 / 10)], 3, 100)
+        simulator = DifficultySimulator(config, seed=1)
+        simulator.CHAIN_WINDOW = 20
+        result = simulator.run()
+        self.assertEqual(len(result.block_times), 100)
+
+    def test_seed_is_reproducible(self):
+        config = SimulationConfig('steady', [(0, 16 ** 3 / 10)], 3, 100)
+        first = DifficultySimulator(config, seed=7).run()
+        second = DifficultySimulator(config, seed=7).run()
+        self.assertEqual(list(first.block_times), list(second.block_times))
+
+    def test_summary(self):
+        result = DifficultySimulator(SimulationConfig('steady', [(0, 16 ** 3 / 10)], 3, 100), seed=1).run()
+        summary = result.summary()
+        self.assertEqual(summary['name'], 'steady')
+        self.assertEqual(summary['blocks'], 100)
+        self.assertLessEqual(summary['p50_block_time'], summary['p90_block_time'])
+        self.assertLessEqual(summary['p90_block_time'], summary['p99_block_time'])
+        counts, edges = result.histogram(bins=5)
+        self.assertEqual(counts.sum(), 100)
+        self.assertEqual(len(edges), 6)
+
+    def test_default_configs(self):
+        configs = default_configs(10)
+        self.assertTrue(all(config.block_count == 10 for config in configs))
+        self.assertEqual(len({config.name for config in configs}), len(configs))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+from haslo_blockchain.block import Block
+from haslo_blockchain.storage.archive_segment import ArchiveSegment
+from haslo_blockchain.storage.compression_dictionary import CompressionDictionary
+from haslo_blockchain.tests.fixtures import transfer_transaction
+
+
+def create_transaction(nonce):
+    return transfer_transaction(payload={"recipient": f"recipient_{nonce}", "amount": nonce * 10}, nonce=nonce)
+
+
+def create_blocks(first_index, count):
+    return [
+        Block(index, [create_transaction(index), create_transaction(index + 1)], f'hash_{index - 1}', index * 7, 2,
+              1638307200 + index, f'hash_{index}')
+        for index in range(first_index, first_index + count)
+    ]
+
+
+class TestArchiveSegment(unittest.TestCase):
+    def test_seal_and_read(self):
+        blocks = create_blocks(100, 40)
+        segment = ArchiveSegment.seal(blocks, blocks_per_chunk=8)
+        self.assertEqual(len(segment), 40)
+        self.assertEqual(segment.first_index, 100)
+        self.assertEqual(segment.last_index, 139)
+        self.assertEqual(segment.chunk_count, 5)
+        for block in blocks:
+            self.assertEqual(segment.read_block(block.index).to_dict(), block.to_dict())
+
+    def test_random_read_decompresses_single_chunk(self):
+        segment = ArchiveSegment.seal(create_blocks(0, 40), blocks_per_chunk=8)
+        segment.read_block(17)
+        cached_chunk_number, cached_chunk = segment._cached_chunk
+        self.assertEqual(cached_chunk_number, 2)
+        self.assertEqual(len(cached_chunk), sum(
+            len(ArchiveSegment.encode_block(block)) for block in create_blocks(16, 8)
+        ))
+
+    def test_blocks(self):
+        blocks = create_blocks(5, 10)
+        segment = ArchiveSegment.seal(blocks, blocks_per_chunk=3)
+        self.assertEqual([block.to_dict() for block in segment.blocks()], [block.to_dict() for block in blocks])
+
+    def test_contains(self):
+        segment = ArchiveSegment.seal(create_blocks(5, 10))
+        self.assertIn(5, segment)
+        self.assertIn(14, segment)
+        self.assertNotIn(4, segment)
+        self.assertNotIn(15, segment)
+        with self.assertRaises(IndexError):
+            segment.read_block(15)
+
+    def test_dictionary(self):
+        blocks = create_blocks(0, 32)
+        dictionary = CompressionDictionary.train(ArchiveSegment.encode_block(block) for block in blocks)
+        plain_segment = ArchiveSegment.seal(blocks, blocks_per_chunk=4)
+        dictionary_segment = ArchiveSegment.seal(blocks, dictionary, blocks_per_chunk=4)
+        self.assertLess(len(dictionary_segment.data), len(plain_segment.data))
+        self.assertEqual(dictionary_segment.read_block(9).to_dict(), blocks[9].to_dict())
+        with self.assertRaises(ValueError):
+            ArchiveSegment(dictionary_segment.data)
+        with self.assertRaises(ValueError):
+            ArchiveSegment(dictionary_segment.data, CompressionDictionary(b'other'))
+        self.assertEqual(ArchiveSegment(plain_segment.data, dictionary).read_block(9).to_dict(), blocks[9].to_dict())
+
+    def test_lzma(self):
+        blocks = create_blocks(0, 10)
+        segment = ArchiveSegment.seal(blocks, codec=ArchiveSegment.CODEC_LZMA)
+        self.assertEqual(segment.codec, ArchiveSegment.CODEC_LZMA)
+        self.assertEqual(segment.read_block(3).to_dict(), blocks[3].to_dict())
+        with self.assertRaises(ValueError):
+            ArchiveSegment.seal(blocks, CompressionDictionary(b'"chain_id":'), codec=ArchiveSegment.CODEC_LZMA)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            ArchiveSegment.seal([])
+        with self.assertRaises(ValueError):
+            ArchiveSegment.seal(create_blocks(0, 2) + create_blocks(5, 2))
+        with self.assertRaises(ValueError):
+            ArchiveSegment(b'\x00' * ArchiveSegment.HEADER.size)
+
+    def test_write_and_open(self):
+        blocks = create_blocks(0, 20)
+        segment = ArchiveSegment.seal(blocks)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'segment.hbas')
+            segment.write(path)
+            with ArchiveSegment.open(path) as opened:
+                self.assertEqual(opened.read_block(19).to_dict(), blocks[19].to_dict())
+            self.assertTrue(opened.data.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+
+from haslo_blockchain.storage.compression_dictionary import CompressionDictionary
+
+
+class TestCompressionDictionary(unittest.TestCase):
+    def test_train_keeps_repeated_fragments(self):
+        samples = [
+            b'{"chain_id":{"chain_id":"main","version":1},"nonce":1}',
+            b'{"chain_id":{"chain_id":"main","version":1},"nonce":2}',
+        ]
+        dictionary = CompressionDictionary.train(samples)
+        self.assertIn(b'"chain_id":{', dictionary.data)
+        self.assertIn(b'"version":', dictionary.data)
+        self.assertNotIn(b'"unique":', dictionary.data)
+
+    def test_train_respects_size(self):
+        samples = [f'{{"key_{i}":1}}'.encode() for i in range(100)] * 2
+        dictionary = CompressionDictionary.train(samples, size=50)
+        self.assertLessEqual(len(dictionary.data), 50)
+
+    def test_dictionary_id(self):
+        self.assertEqual(CompressionDictionary(b'abc').dictionary_id, CompressionDictionary(b'abc').dictionary_id)
+        self.assertNotEqual(CompressionDictionary(b'abc').dictionary_id, CompressionDictionary(b'abd').dictionary_id)
+        self.assertEqual(len(CompressionDictionary(b'abc').dictionary_id), 8)
+
+    def test_save_and_load(self):
+        dictionary = CompressionDictionary(b'"chain_id":')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'dictionary.bin')
+            dictionary.save(path)
+            loaded = CompressionDictionary.load(path)
+        self.assertEqual(loaded.data, dictionary.data)
+        self.assertEqual(loaded.dictionary_id, dictionary.dictionary_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,10 @@
 import unittest
+from unittest.mock import Mock
 
 from haslo_blockchain.block import Block
+from haslo_blockchain.security.hashing import Hashing
+from haslo_blockchain.tests.fixtures import TRANSFER_TRANSACTION_DICT, transfer_transaction
+from haslo_blockchain.transaction import Transaction
 
 
 class TestBlock(unittest.TestCase):
@@ -25,7 +29,7 @@ class TestBlock(unittest.TestCase):
     def test_equality(self):
         block1 = Block(
             'index',
-            'transactions',
+            [],
             'previous_hash',
             'proof',
             'difficulty',
@@ -34,7 +38,7 @@ class TestBlock(unittest.TestCase):
         )
         block2 = Block(
             'index',
-            'transactions',
+            [],
             'previous_hash',
             'proof',
             'difficulty',
@@ -43,6 +47,127 @@ class TestBlock(unittest.TestCase):
         )
         self.assertEqual(block1, block2)
 
+    def test_identity_by_hash(self):
+        block = Block(1, [], 'previous_hash', 123, 4, 1638307200, 'current_hash')
+        same_contents = Block(1, [], 'previous_hash', 123, 4, 1638307200, 'other_hash')
+        forged = Block(2, [], 'other_hash', 321, 5, 1638307201, 'current_hash')
+        self.assertEqual(block, same_contents)
+        self.assertNotEqual(block, forged)
+        self.assertNotEqual(block, 'current_hash')
+        self.assertEqual(len({block, same_contents, forged}), 2)
+        self.assertEqual({block: 'value'}[same_contents], 'value')
+
+    def test_eager_transactions_are_immutable(self):
+        block = Block(1, [transfer_transaction()], 'previous_hash', 123, 4, 1638307200, None)
+        block_hash = block.block_hash
+        with self.assertRaises(AttributeError):
+            block.transactions.append(transfer_transaction(nonce=2))
+        self.assertEqual(block.block_hash, block.compute_hash())
+        block.transactions = block.transactions + (transfer_transaction(nonce=2),)
+        self.assertNotEqual(block.block_hash, block_hash)
+        self.assertEqual(block.block_hash, block.compute_hash())
+
+    def test_block_hash_follows_header_changes(self):
+        block = Block(1, [], 'previous_hash', 123, 4, 1638307200, None)
+        original_hash = block.block_hash
+        block.proof = 124
+        self.assertNotEqual(block.block_hash, original_hash)
+        self.assertEqual(block.block_hash, block.compute_hash())
+        block.proof = 123
+        self.assertEqual(block.block_hash, original_hash)
+
+    def test_block_hash_without_current_hash(self):
+        block = Block(1, [], 'previous_hash', 123, 4, 1638307200, None)
+        self.assertEqual(block.block_hash, block.compute_hash())
+        self.assertEqual(block, Block(1, [], 'previous_hash', 123, 4, 1638307200, block.compute_hash()))
+        block.transactions = [Transaction.from_dict(TRANSFER_TRANSACTION_DICT)]
+        self.assertEqual(block.block_hash, block.compute_hash())
+
+    def test_compute_hash(self):
+        block = Block(1, [], 'previous_hash', 123, 4, 1638307200, None)
+        self.assertEqual(len(block.compute_hash()), 64)
+        self.assertEqual(block.compute_hash(), Block(1, [], 'previous_hash', 123, 4, 1638307200, 'x').compute_hash())
+        self.assertNotEqual(block.compute_hash(), Block(1, [], 'previous_hash', 124, 4, 1638307200, None).compute_hash())
+
+    def test_to_dict(self):
+        transaction = Mock()
+        transaction.to_dict = Mock(return_value={'transaction': 'dict'})
+        block = Block(1, [transaction], 'previous_hash', 123, 4, 1638307200, 'current_hash')
+        expected_dict = {
+            'index': 1,
+            'timestamp': 1638307200,
+            'transactions': [{'transaction': 'dict'}],
+            'previous_hash': 'previous_hash',
+            'proof': 123,
+            'difficulty': 4,
+            'current_hash': 'current_hash',
+        }
+        self.assertEqual(block.to_dict(), expected_dict)
+
+    def test_from_dict(self):
+        transaction_dict = TRANSFER_TRANSACTION_DICT
+        block = Block.from_dict({
+            'index': 1,
+            'timestamp': 1638307200,
+            'transactions': [transaction_dict],
+            'previous_hash': 'previous_hash',
+            'proof': 123,
+            'difficulty': 4,
+            'current_hash': 'current_hash',
+        })
+        self.assertEqual(block.index, 1)
+        self.assertEqual(block.timestamp, 1638307200)
+        self.assertEqual(block.transactions[0].to_dict(), transaction_dict)
+        self.assertEqual(block.previous_hash, 'previous_hash')
+        self.assertEqual(block.proof, 123)
+        self.assertEqual(block.difficulty, 4)
+        self.assertEqual(block.current_hash, 'current_hash')
+
+    def test_from_encoded_decodes_lazily(self):
+        transactions = [Transaction.from_dict(TRANSFER_TRANSACTION_DICT), Transaction.from_dict(TRANSFER_TRANSACTION_DICT)]
+        encoded_transactions = Hashing.encode_transactions(transactions)
+        block = Block.from_encoded(1, encoded_transactions, 'previous_hash', 123, 4, 1638307200, 'current_hash')
+        eager_block = Block(1, transactions, 'previous_hash', 123, 4, 1638307200, 'current_hash')
+        self.assertEqual(block.compute_hash(), eager_block.compute_hash())
+        self.assertIs(block.encoded_transactions, encoded_transactions)
+        self.assertIsNone(block._transaction_dicts)
+        self.assertEqual(block.transaction(1).to_dict(), TRANSFER_TRANSACTION_DICT)
+        self.assertEqual(list(block._decoded_transactions), [1])
+        self.assertIsNone(block._transactions)
+        self.assertIs(block.transactions[1], block.transaction(1))
+        self.assertEqual(len(block.transactions), 2)
+        self.assertIs(block.encoded_transactions, encoded_transactions)
+
+    def test_lazy_transactions_are_immutable(self):
+        encoded_transactions = Hashing.encode_transactions([Transaction.from_dict(TRANSFER_TRANSACTION_DICT)])
+        block = Block.from_encoded(1, encoded_transactions, 'previous_hash', 123, 4, 1638307200, 'current_hash')
+        hash_before = block.compute_hash()
+        self.assertIsInstance(block.transactions, tuple)
+        with self.assertRaises(AttributeError):
+            block.transactions.append(Transaction.from_dict(TRANSFER_TRANSACTION_DICT))
+        self.assertEqual(block.compute_hash(), hash_before)
+
+    def test_to_dict_without_decoding_transactions(self):
+        encoded_transactions = Hashing.encode_transactions([Transaction.from_dict(TRANSFER_TRANSACTION_DICT)])
+        block = Block.from_encoded(1, encoded_transactions, 'previous_hash', 123, 4, 1638307200, 'current_hash')
+        self.assertEqual(block.to_dict()['transactions'], [TRANSFER_TRANSACTION_DICT])
+        self.assertEqual(block._decoded_transactions, {})
+
+    def test_replace_transactions(self):
+        encoded_transactions = Hashing.encode_transactions([Transaction.from_dict(TRANSFER_TRANSACTION_DICT)])
+        block = Block.from_encoded(1, encoded_transactions, 'previous_hash', 123, 4, 1638307200, 'current_hash')
+        block.transactions = []
+        self.assertEqual(block.encoded_transactions, b'[]')
+        self.assertEqual(block.to_dict()['transactions'], [])
+
+    def test_encode_and_decode(self):
+        block = Block(1, [Transaction.from_dict(TRANSFER_TRANSACTION_DICT)], 'previous_hash', 123, 4, 1638307200.5, 'hash')
+        encoded_block = block.encode()
+        decoded_block = Block.decode(encoded_block)
+        self.assertEqual(decoded_block.to_dict(), block.to_dict())
+        self.assertEqual(decoded_block.compute_hash(), block.compute_hash())
+        self.assertEqual(decoded_block.encode(), encoded_block)
+
 
 if __name__ == '__main__':
     unittest.main()
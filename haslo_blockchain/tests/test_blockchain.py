@@ -0,0 +1,165 @@
+import threading
+import unittest
+
+from haslo_blockchain.block import Block
+from haslo_blockchain.blockchain import Blockchain
+from haslo_blockchain.mining.miner import Miner
+from haslo_blockchain.util.genesis import Genesis
+
+
+def mine_block(blockchain):
+    snapshot = blockchain.snapshot
+    proof = Miner.proof_of_work(blockchain, snapshot.last_block)
+    return blockchain.create_block([], snapshot.last_block.current_hash, proof, snapshot.difficulty, False)
+
+
+class TestBlockchain(unittest.TestCase):
+    def test_initialization(self):
+        blockchain = Genesis(difficulty=1).create_genesis_blockchain()
+        self.assertEqual(blockchain.difficulty, 1)
+        self.assertEqual(len(blockchain.chain), 1)
+        self.assertEqual(len(blockchain.snapshot), 1)
+        self.assertEqual(blockchain.snapshot.last_block, blockchain.last_block)
+        self.assertEqual(blockchain.snapshot.difficulty, 1)
+
+    def test_invalid_chain(self):
+        with self.assertRaises(ValueError):
+            Blockchain(1, 'not a chain')
+
+    def test_create_block(self):
+        blockchain = Genesis(difficulty=1).create_genesis_blockchain()
+        block = mine_block(blockchain)
+        self.assertEqual(block.index, 1)
+        self.assertEqual(block.current_hash, block.compute_hash())
+        self.assertEqual(blockchain.last_block, block)
+        self.assertEqual(blockchain.snapshot.last_block, block)
+        self.assertTrue(blockchain.valid_chain())
+
+    def test_create_block_rejects_stale_tip(self):
+        blockchain = Genesis(difficulty=1).create_genesis_blockchain()
+        source = Blockchain(1, [blockchain.last_block])
+        snapshot = blockchain.snapshot
+        proof = Miner.proof_of_work(blockchain, snapshot.last_block)
+        # another node's block lands between the proof-of-work and create_block
+        self.assertTrue(blockchain.import_block(mine_block(source)))
+        self.assertIsNone(blockchain.create_block([], snapshot.last_block.current_hash, proof, 1, False))
+        self.assertEqual(len(blockchain.snapshot), 2)
+        self.assertTrue(blockchain.valid_chain())
+
+    def test_create_block_rejects_invalid_proof(self):
+        blockchain = Genesis(difficulty=1).create_genesis_blockchain()
+        last_block = blockchain.last_block
+        proof = next(proof for proof in range(1000) if not Blockchain.valid_proof(last_block.proof, proof, 1))
+        self.assertIsNone(blockchain.create_block([], last_block.current_hash, proof, 1, False))
+        self.assertEqual(len(blockchain.snapshot), 1)
+
+    def test_create_block_rejects_stale_difficulty(self):
+        blockchain = Genesis(difficulty=1).create_genesis_blockchain()
+        snapshot = blockchain.snapshot
+        proof = Miner.proof_of_work(blockchain, snapshot.last_block)
+        blockchain.difficulty = 3
+        self.assertIsNone(blockchain.create_block([], snapshot.last_block.current_hash, proof, 1, False))
+        self.assertEqual(len(blockchain.snapshot), 1)
+
+    def test_add_block_adjusts_difficulty(self):
+        blockchain = Genesis(difficulty=1).create_genesis_blockchain()
+        genesis = blockchain.last_block
+        for index in range(1, 11):
+            blockchain.add_block(Block(index, [], blockchain.last_block.current_hash, 0, 1, genesis.timestamp + index,
+                                       str(index)), adjust_difficulty=True)
+        # blocks one second apart are well under the ten second target
+        self.assertEqual(blockchain.difficulty, 2)
+        self.assertEqual(blockchain.snapshot.difficulty, 2)
+        self.assertEqual(len(blockchain.snapshot), 11)
+
+    def test_import_block(self):
+        source = Genesis(difficulty=1).create_genesis_blockchain()
+        blockchain = Blockchain(1, [source.last_block])
+        block = mine_block(source)
+        self.assertTrue(blockchain.import_block(block))
+        self.assertEqual(blockchain.snapshot.last_block, block)
+        self.assertFalse(blockchain.import_block(block))
+        self.assertEqual(len(blockchain.snapshot), 2)
+
+    def test_snapshot_is_stable(self):
+        blockchain = Genesis(difficulty=1).create_genesis_blockchain()
+        snapshot = blockchain.snapshot
+        mine_block(blockchain)
+        blockchain.difficulty = 2
+        self.assertEqual(len(snapshot), 1)
+        self.assertEqual(snapshot.difficulty, 1)
+        self.assertEqual(len(blockchain.snapshot), 2)
+        self.assertEqual(blockchain.snapshot.difficulty, 2)
+
+    def test_equality(self):
+        blockchain = Genesis(difficulty=1).create_genesis_blockchain()
+        for _ in range(3):
+            mine_block(blockchain)
+        copy = Blockchain(1, list(blockchain.chain))
+        self.assertEqual(blockchain, copy)
+        self.assertTrue(blockchain.equals(copy, deep_verify=True))
+        mine_block(copy)
+        self.assertNotEqual(blockchain, copy)
+        self.assertNotEqual(blockchain, 'blockchain')
+
+    def test_deep_verify(self):
+        blockchain = Genesis(difficulty=1).create_genesis_blockchain()
+        mine_block(blockchain)
+        block = blockchain.last_block
+        forged_hash = Blockchain(1, [blockchain.chain[0]])
+        forged_hash.add_block(Block(block.index, [], block.previous_hash, block.proof, block.difficulty,
+                                    block.timestamp, 'forged'))
+        self.assertTrue(blockchain.equals(forged_hash))
+        self.assertFalse(blockchain.equals(forged_hash, deep_verify=True))
+
+    def test_deep_verify_checks_links_and_proofs(self):
+        genesis = Genesis(difficulty=1).create_genesis_blockchain().last_block
+        invalid_proof = next(proof for proof in range(1000) if not Blockchain.valid_proof(genesis.proof, proof, 1))
+        for previous_hash, proof in (('unlinked', Miner.proof_of_work(Blockchain(1, [genesis]), genesis)),
+                                     (genesis.current_hash, invalid_proof)):
+            block = Block(1, [], previous_hash, proof, 1, genesis.timestamp + 1, None)
+            block.current_hash = block.compute_hash()
+            blockchain = Blockchain(1, [genesis])
+            blockchain.add_block(block)
+            copy = Blockchain(1, [genesis])
+            copy.add_block(Block.from_dict(block.to_dict()))
+            self.assertTrue(blockchain.equals(copy))
+            self.assertFalse(blockchain.equals(copy, deep_verify=True))
+
+    def test_fork_index(self):
+        blockchain = Genesis(difficulty=1).create_genesis_blockchain()
+        for _ in range(3):
+            mine_block(blockchain)
+        fork = Blockchain(1, blockchain.chain[:2])
+        for _ in range(4):
+            mine_block(fork)
+        self.assertEqual(blockchain.fork_index(fork), 1)
+        self.assertEqual(fork.fork_index(blockchain), 1)
+        self.assertEqual(blockchain.fork_index(blockchain), 3)
+        self.assertEqual(blockchain.fork_index(Genesis(difficulty=1).create_genesis_blockchain()), -1)
+
+    def test_concurrent_readers(self):
+        blockchain = Genesis(difficulty=1).create_genesis_blockchain()
+        errors = []
+        done = threading.Event()
+
+        def read():
+            while not done.is_set():
+                snapshot = blockchain.snapshot
+                if snapshot.last_block.index != len(snapshot) - 1 or snapshot[-1] is not snapshot.last_block:
+                    errors.append(snapshot)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for _ in range(50):
+            mine_block(blockchain)
+        done.set()
+        for reader in readers:
+            reader.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(blockchain.snapshot), 51)
+
+
+if __name__ == '__main__':
+    unittest.main()
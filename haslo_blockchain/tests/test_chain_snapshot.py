@@ -0,0 +1,40 @@
+import unittest
+
+from haslo_blockchain.chain_snapshot import ChainSnapshot
+
+
+class TestChainSnapshot(unittest.TestCase):
+    def test_initialization(self):
+        snapshot = ChainSnapshot(['block0', 'block1', 'block2'], 2, 4)
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(snapshot.difficulty, 4)
+        self.assertEqual(snapshot.last_block, 'block1')
+
+    def test_empty(self):
+        snapshot = ChainSnapshot([], 0, 1)
+        self.assertEqual(len(snapshot), 0)
+        self.assertIsNone(snapshot.last_block)
+        self.assertEqual(list(snapshot), [])
+
+    def test_ignores_later_blocks(self):
+        blocks = ['block0', 'block1']
+        snapshot = ChainSnapshot(blocks, 2, 1)
+        blocks.append('block2')
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(list(snapshot), ['block0', 'block1'])
+        self.assertEqual(snapshot[-1], 'block1')
+        self.assertEqual(snapshot[-2:], ['block0', 'block1'])
+        with self.assertRaises(IndexError):
+            snapshot[2]
+
+    def test_getitem(self):
+        snapshot = ChainSnapshot(['block0', 'block1', 'block2'], 3, 1)
+        self.assertEqual(snapshot[0], 'block0')
+        self.assertEqual(snapshot[-1], 'block2')
+        self.assertEqual(snapshot[1:], ['block1', 'block2'])
+        with self.assertRaises(IndexError):
+            snapshot[-4]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -119,6 +119,25 @@ class TestTransaction(unittest.TestCase):
         }
         self.assertEqual(transaction_dict, expected_dict)
 
+    def test_identity_by_hash(self):
+        data = {
+            "type": "transfer",
+            "sender": "sender_address",
+            "payload": {"recipient": "recipient_address", "amount": 100},
+            "nonce": 1,
+            "chain_id": {"chain_id": 1, "version": 1},
+            "gas": {"tip": 10, "max_fee": 50, "limit": 21000},
+            "signature": {"type": "type", "v": 27, "r": "r_value", "s": "s_value", "public_key": "public_key"},
+        }
+        transaction = Transaction.from_dict(data)
+        same_transaction = Transaction.from_dict(data)
+        other_transaction = Transaction.from_dict(dict(data, nonce=2))
+        self.assertEqual(len(transaction.transaction_hash), 64)
+        self.assertEqual(transaction, same_transaction)
+        self.assertNotEqual(transaction, other_transaction)
+        self.assertNotEqual(transaction, data)
+        self.assertEqual(len({transaction, same_transaction, other_transaction}), 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -16,7 +16,7 @@ class TestGenesis(unittest.TestCase):
         block = genesis.create_block(0, [], '0', 0)
         self.assertIsInstance(block, Block)
         self.assertEqual(block.index, 0)
-        self.assertEqual(block.transactions, [])
+        self.assertEqual(block.transactions, ())
         self.assertEqual(block.previous_hash, '0')
         self.assertEqual(block.proof, 0)
         self.assertEqual(block.difficulty, 1)
@@ -29,7 +29,7 @@ class TestGenesis(unittest.TestCase):
         block = genesis.create_block(3, [transaction], '0123', 123)
         self.assertIsInstance(block, Block)
         self.assertEqual(block.index, 3)
-        self.assertEqual(block.transactions, [transaction])
+        self.assertEqual(block.transactions, (transaction,))
         self.assertEqual(block.previous_hash, '0123')
         self.assertEqual(block.proof, 123)
         self.assertEqual(block.difficulty, 1)
@@ -40,7 +40,7 @@ class TestGenesis(unittest.TestCase):
         block = genesis.create_genesis_block()
         self.assertIsInstance(block, Block)
         self.assertEqual(block.index, 0)
-        self.assertEqual(block.transactions, [])
+        self.assertEqual(block.transactions, ())
         self.assertEqual(block.previous_hash, '0')
         self.assertEqual(block.proof, 0)
         self.assertEqual(block.difficulty, 1)
@@ -52,7 +52,7 @@ class TestGenesis(unittest.TestCase):
         self.assertIsInstance(blockchain, Blockchain)
         self.assertEqual(len(blockchain.chain), 1)
         self.assertEqual(blockchain.chain[0].index, 0)
-        self.assertEqual(blockchain.chain[0].transactions, [])
+        self.assertEqual(blockchain.chain[0].transactions, ())
         self.assertEqual(blockchain.chain[0].previous_hash, '0')
         self.assertEqual(blockchain.chain[0].proof, 0)
         self.assertEqual(blockchain.chain[0].difficulty, 1)
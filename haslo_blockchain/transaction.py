@@ -1,3 +1,6 @@
+from functools import cached_property
+
+from haslo_blockchain.security.hashing import Hashing
 from haslo_blockchain.transaction_components.chain_id import ChainId
 from haslo_blockchain.transaction_components.gas import Gas
 from haslo_blockchain.transaction_components.payload import Payload
@@ -36,3 +39,13 @@ class Transaction:
             "gas": self.gas.to_dict(),
             "signature": self.signature.to_dict(),
         }
+
+    @cached_property
+    def transaction_hash(self):
+        return Hashing.compute_transaction_hash(self.to_dict())
+
+    def __eq__(self, other):
+        return isinstance(other, Transaction) and self.transaction_hash == other.transaction_hash
+
+    def __hash__(self):
+        return hash(self.transaction_hash)
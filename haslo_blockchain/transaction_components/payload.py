@@ -9,7 +9,6 @@ class Payload:
         payload_class = {
             MagicStrings.TRANSACTION_TYPE_TRANSFER: TransferPayload,
         }[transaction_type]
-        print(f'\nfound, {payload_class}')
         return payload_class.from_dict(data)
         #except KeyError:
         #    print('\nNOT found')